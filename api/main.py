@@ -1,26 +1,40 @@
 import os
-import json
+import re
+import sys
+import copy
 import logging
+import asyncio
+import functools
+import itertools
+import shutil
+import uuid
+from collections import deque
+import aiofiles
+import orjson
 from typing import Dict, List, Optional
 from fastapi import FastAPI, HTTPException, BackgroundTasks
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
+import yaml
 
-import requests
-from time import sleep
-import subprocess
-import sys
-import time
+try:
+    from yaml import CSafeLoader as SafeLoader, CSafeDumper as SafeDumper
+except ImportError:  # libyaml not available
+    from yaml import SafeLoader, SafeDumper
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 # Initialize FastAPI
-app = FastAPI(title="MetaGPT Self-hosted Chat UI Integration")
+app = FastAPI(title="MetaGPT Self-hosted Chat UI Integration", default_response_class=ORJSONResponse)
 
 # Environment variables
 CHAT_UI_URL = os.getenv("CHAT_UI_URL", "http://localhost:8088")
 
+# Buffer size for reading/writing MetaGPT output files, which can be large
+FILE_BUFFER_SIZE = 128 * 1024
+
 # Role avatar mappings
 ROLE_AVATARS = {
     "Product Manager": "https://ui-avatars.com/api/?name=PM&color=fff&background=2196F3",
@@ -37,6 +51,15 @@ ROLE_AVATARS = {
     "Security Auditor": "https://ui-avatars.com/api/?name=SA&color=fff&background=FF5722"
 }
 
+# Map MetaGPT output keys to roles
+ROLE_MAPPING = {
+    "requirements_analysis": "Requirements Analyst",
+    "system_design": "Architect",
+    "implementation_planning": "Project Manager",
+    "code_generation": "Developer",
+    "code_review": "Code Reviewer"
+}
+
 # Models
 class Message(BaseModel):
     role: str
@@ -56,11 +79,11 @@ class Conversation(BaseModel):
 
 # Store or forward conversation data for the self-hosted chat UI
 # For demo, just save to a file (could be replaced with DB or API call)
-def post_messages_to_channel(conversation: Conversation, background_tasks: BackgroundTasks):
+async def post_messages_to_channel(conversation: Conversation, background_tasks: BackgroundTasks):
     output_path = os.path.join(os.path.dirname(__file__), '../visualization/sample_output.json')
     try:
-        with open(output_path, 'w') as f:
-            json.dump(conversation.dict(), f, indent=2)
+        async with aiofiles.open(output_path, 'w', buffering=FILE_BUFFER_SIZE) as f:
+            await f.write(conversation.model_dump_json(indent=2))
         logger.info(f"Conversation saved to {output_path}")
         return {"success": True, "path": output_path}
     except Exception as e:
@@ -79,7 +102,7 @@ async def root():
 @app.post("/conversations")
 async def create_conversation(conversation: Conversation, background_tasks: BackgroundTasks):
     """Create a new conversation and save for the self-hosted chat UI"""
-    return post_messages_to_channel(conversation, background_tasks)
+    return await post_messages_to_channel(conversation, background_tasks)
 
 @app.post("/process_metagpt_output")
 async def process_metagpt_output(background_tasks: BackgroundTasks, project_name: str, file_path: Optional[str] = None):
@@ -90,34 +113,24 @@ async def process_metagpt_output(background_tasks: BackgroundTasks, project_name
             file_path = "/app/workspace/output.json"
         
         # Read the file
-        with open(file_path, 'r') as f:
-            data = json.load(f)
+        async with aiofiles.open(file_path, 'rb', buffering=FILE_BUFFER_SIZE) as f:
+            data = orjson.loads(await f.read())
         
         # Convert to conversation format
         messages = []
         
         # Process different sections of the output based on roles
+        # Skip validation entries, non-text values and failed stages before any role lookup
+        append = messages.append
         for key, value in data.items():
-            if key.endswith("_validation"):
+            if key.endswith("_validation") or type(value) is not str or value.startswith("Failed"):
                 continue
-            
-            # Map output keys to roles
-            role_mapping = {
-                "requirements_analysis": "Requirements Analyst",
-                "system_design": "Architect",
-                "implementation_planning": "Project Manager",
-                "code_generation": "Developer",
-                "code_review": "Code Reviewer"
-            }
-            
-            role = role_mapping.get(key, "Technical Lead")
-            
-            if isinstance(value, str) and not value.startswith("Failed"):
-                messages.append(Message(role=role, content=value))
+            # Values are already known to be str, so skip re-validation
+            append(Message.model_construct(role=ROLE_MAPPING.get(key, "Technical Lead"), content=value))
         
         if not messages:
             # If no valid messages, add a placeholder
-            messages.append(Message(
+            messages.append(Message.model_construct(
                 role="Technical Lead", 
                 content="The team is still working on this project. Check back later for updates."
             ))
@@ -128,7 +141,7 @@ async def process_metagpt_output(background_tasks: BackgroundTasks, project_name
             project_name=project_name
         )
         
-        return post_messages_to_channel(conversation, background_tasks)
+        return await post_messages_to_channel(conversation, background_tasks)
     
     except Exception as e:
         logger.error(f"Error processing MetaGPT output: {e}")
@@ -136,6 +149,151 @@ async def process_metagpt_output(background_tasks: BackgroundTasks, project_name
     finally:
         pass
 
+# Base config parsing is cached per (path, mtime) so edits to config.yml are picked up
+@functools.lru_cache(maxsize=4)
+def _load_base_config(config_path: str, mtime: float) -> dict:
+    with open(config_path, 'r') as f:
+        return yaml.load(f, Loader=SafeLoader) or {}
+
+@functools.lru_cache(maxsize=4)
+def _all_model_names(config_path: str, mtime: float) -> tuple:
+    """Collect every model referenced in the MODEL_REGISTRY section of the config"""
+    config = _load_base_config(config_path, mtime)
+    models = set()
+    try:
+        # Extract models from the MODEL_REGISTRY section
+        model_capabilities = config.get("MODEL_REGISTRY", {}).get("model_capabilities", {})
+        models.update(itertools.chain.from_iterable(model_capabilities.values()))
+        
+        # Add fallback models
+        fallback_models = config.get("MODEL_REGISTRY", {}).get("fallback_free_models", [])
+        models.update(fallback_models)
+        
+        # Add default models
+        default_models = config.get("MODEL_REGISTRY", {}).get("default_models_by_task", {}).values()
+        models.update(itertools.chain.from_iterable(
+            model_list for model_list in default_models if isinstance(model_list, list)
+        ))
+    except Exception as e:
+        logger.warning(f"Error extracting models from config: {str(e)}")
+        # Use hardcoded default models as fallback
+        models = [
+            "deepseek/deepseek-chat-v3-0324:free",
+            "meta-llama/llama-4-maverick:free",
+            "google/gemini-2.5-pro-exp-03-25:free"
+        ]
+    return tuple(models)
+
+# Project directory; each MetaGPT job runs in its own workspace/workspace_<job_id>
+PARENT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+WORKSPACE_ROOT = os.path.join(PARENT_DIR, "workspace")
+
+# Background MetaGPT runs still in progress, keyed by job id. Holds the tasks so
+# they are not garbage collected; entries are dropped as each job finishes
+JOBS: Dict[str, asyncio.Task] = {}
+
+JOB_ID_RE = re.compile(r"[0-9a-f]{32}")
+
+def _job_run_dir(job_id: str) -> str:
+    """Run directory of a job; keyed by job id so concurrent runs never share one"""
+    return os.path.join(WORKSPACE_ROOT, f"workspace_{job_id}")
+
+# Bound the number of MetaGPT subprocesses running at once; extra jobs wait as pending
+RUN_SEMAPHORE = asyncio.Semaphore(int(os.getenv("MAX_METAGPT_CONCURRENCY", "2")))
+
+async def _write_job_status(run_dir: str, status: Dict):
+    async with aiofiles.open(os.path.join(run_dir, "status.json"), "wb", buffering=FILE_BUFFER_SIZE) as f:
+        await f.write(orjson.dumps(status))
+
+# Number of trailing subprocess output lines kept in memory for error reporting
+OUTPUT_TAIL_LINES = 200
+
+async def _drain(stream: asyncio.StreamReader, log_file, tail: deque):
+    """Copy a subprocess stream into the run log, keeping only the last lines in memory.
+    
+    The stream is read in fixed-size chunks rather than by line, so arbitrarily long
+    output lines cannot overflow the reader's buffer limit. Lines are split out of the
+    chunks for the tail; a line still being received is capped at FILE_BUFFER_SIZE bytes.
+    """
+    partial = b""
+    while True:
+        chunk = await stream.read(FILE_BUFFER_SIZE)
+        if not chunk:
+            break
+        await log_file.write(chunk)
+        lines = (partial + chunk).split(b"\n")
+        partial = lines.pop()[-FILE_BUFFER_SIZE:]
+        tail.extend(line.decode(errors="replace") + "\n" for line in lines)
+    if partial:
+        tail.append(partial.decode(errors="replace"))
+
+async def _run_job(job_id: str, cmd: List[str], run_dir: str, output_file: str, log_path: str, env: Dict[str, str]):
+    """Run run_collaborative.py for a job and record its outcome in run_dir/status.json"""
+    try:
+        stdout_tail = deque(maxlen=OUTPUT_TAIL_LINES)
+        stderr_tail = deque(maxlen=OUTPUT_TAIL_LINES)
+        async with RUN_SEMAPHORE:
+            await _write_job_status(run_dir, {"job_id": job_id, "status": "running"})
+            logger.info(f"Running command: {' '.join(cmd)}")
+            
+            # Execute the command without blocking the event loop
+            proc = await asyncio.create_subprocess_exec(
+                *cmd,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                env=env
+            )
+            # Stream output to the run log instead of buffering all of it
+            async with aiofiles.open(log_path, "wb", buffering=FILE_BUFFER_SIZE) as log_file:
+                drains = asyncio.gather(
+                    _drain(proc.stdout, log_file, stdout_tail),
+                    _drain(proc.stderr, log_file, stderr_tail)
+                )
+                try:
+                    await drains
+                except BaseException:
+                    # Stop the other drain before the log closes, and kill and reap the
+                    # child so it is not left blocked on a pipe nobody reads
+                    drains.cancel()
+                    await asyncio.gather(drains, return_exceptions=True)
+                    if proc.returncode is None:
+                        try:
+                            proc.kill()
+                        except ProcessLookupError:
+                            pass
+                    await proc.wait()
+                    raise
+            returncode = await proc.wait()
+        stdout = "".join(stdout_tail)
+        stderr = "".join(stderr_tail)
+        
+        if returncode != 0:
+            error_msg = f"MetaGPT execution failed with code {returncode}"
+            logger.error(error_msg)
+            if stdout:
+                logger.error(f"Command stdout (last {OUTPUT_TAIL_LINES} lines):\n{stdout}")
+            if stderr:
+                logger.error(f"Command stderr (last {OUTPUT_TAIL_LINES} lines):\n{stderr}")
+            await _write_job_status(run_dir, {"job_id": job_id, "status": "failed", "error": f"{error_msg}: {stderr}"})
+            return
+        
+        # Log command output
+        if stdout:
+            logger.info(f"Command stdout saved to {log_path}, tail:\n{stdout[-1000:]}")
+        
+        # Check if output file was created
+        if not os.path.exists(output_file):
+            await _write_job_status(run_dir, {"job_id": job_id, "status": "failed", "error": "MetaGPT output.json not generated"})
+            return
+        
+        # Load and record the result
+        async with aiofiles.open(output_file, "rb", buffering=FILE_BUFFER_SIZE) as f:
+            result = orjson.loads(await f.read())
+        await _write_job_status(run_dir, {"job_id": job_id, "status": "done", "result": result})
+    except Exception as e:
+        logger.exception(f"Unexpected error in MetaGPT job {job_id}: {str(e)}")
+        await _write_job_status(run_dir, {"job_id": job_id, "status": "failed", "error": f"Unexpected error: {str(e)}"})
+
 # Run MetaGPT via run_collaborative.py script
 class PromptRequest(BaseModel):
     prompt: str
@@ -145,42 +303,37 @@ class PromptRequest(BaseModel):
 
 @app.post("/api/run_metagpt")
 async def run_metagpt(prompt_request: PromptRequest):
-    """Run MetaGPT with the collaborative workflow."""
+    """Start MetaGPT with the collaborative workflow and return a job id to poll."""
     logger.info(f"Received run_metagpt request with prompt: {prompt_request.prompt[:100]}...")
     try:
         # Get project directory
-        parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-        workspace_root = os.path.join(parent_dir, "workspace")
-        os.makedirs(workspace_root, exist_ok=True)
+        parent_dir = PARENT_DIR
+        os.makedirs(WORKSPACE_ROOT, exist_ok=True)
         
         # Create logs directory if it doesn't exist
         logs_dir = os.path.join(parent_dir, "logs")
-        if not os.path.exists(logs_dir):
-            os.makedirs(logs_dir, exist_ok=True)
-            logger.info(f"Created logs directory: {logs_dir}")
+        os.makedirs(logs_dir, exist_ok=True)
         
-        # Create workspace instance directory with timestamp
-        timestamp = int(time.time())
-        run_dir = os.path.join(workspace_root, f"workspace_{timestamp}")
-        os.makedirs(run_dir, exist_ok=True)
+        # Create the workspace instance directory for this job
+        job_id = uuid.uuid4().hex
+        run_dir = _job_run_dir(job_id)
+        os.makedirs(run_dir)
         
         # Create workflows directory inside the run_dir
         workspace_workflows_dir = os.path.join(run_dir, "workflows")
-        if not os.path.exists(workspace_workflows_dir):
-            os.makedirs(workspace_workflows_dir, exist_ok=True)
-            logger.info(f"Created workflows directory in workspace: {workspace_workflows_dir}")
+        os.makedirs(workspace_workflows_dir, exist_ok=True)
             
         # Create logs directory inside the run_dir
         workspace_logs_dir = os.path.join(run_dir, "logs")
-        if not os.path.exists(workspace_logs_dir):
-            os.makedirs(workspace_logs_dir, exist_ok=True)
-            logger.info(f"Created logs directory in workspace: {workspace_logs_dir}")
+        os.makedirs(workspace_logs_dir, exist_ok=True)
 
         # Set API_LOG_DIR to include both log directories
         # This is a special format that the CollaborativeConversation class will recognize
-        # to save logs in both locations
-        os.environ["API_LOG_DIR"] = f"{logs_dir}:{workspace_logs_dir}"
-        os.environ["WORKSPACE_DIR"] = run_dir
+        # to save logs in both locations. The environment is per job so concurrent
+        # runs don't overwrite each other's settings.
+        job_env = dict(os.environ)
+        job_env["API_LOG_DIR"] = f"{logs_dir}:{workspace_logs_dir}"
+        job_env["WORKSPACE_DIR"] = run_dir
         logger.info(f"Set API_LOG_DIR to include both global and workspace logs: {logs_dir} and {workspace_logs_dir}")
         logger.info(f"Set WORKSPACE_DIR to: {run_dir}")
         
@@ -188,19 +341,17 @@ async def run_metagpt(prompt_request: PromptRequest):
         # This is more reliable than relying on environment variables in Docker
         config_path = os.path.join(parent_dir, "config.yml")
         
-        # Use proper YAML parsing/writing instead of string replacement
-        import yaml
-        
-        # Read the original config
-        with open(config_path, 'r') as f:
-            try:
-                config = yaml.safe_load(f)
-            except yaml.YAMLError as e:
-                logger.error(f"Error parsing config file: {str(e)}")
-                raise HTTPException(status_code=500, detail=f"Error parsing config file: {str(e)}")
-            except Exception as e:
-                logger.error(f"Error reading config file: {str(e)}")
-                raise HTTPException(status_code=500, detail=f"Error reading config file: {str(e)}")
+        # Read the original config (parsed once per file revision), then copy it
+        # so the per-request API key never leaks into the cached base config
+        try:
+            config_mtime = os.stat(config_path).st_mtime
+            config = copy.deepcopy(_load_base_config(config_path, config_mtime))
+        except yaml.YAMLError as e:
+            logger.error(f"Error parsing config file: {str(e)}")
+            raise HTTPException(status_code=500, detail=f"Error parsing config file: {str(e)}")
+        except Exception as e:
+            logger.error(f"Error reading config file: {str(e)}")
+            raise HTTPException(status_code=500, detail=f"Error reading config file: {str(e)}")
         
         # Get API key from request or environment
         api_key = None
@@ -234,42 +385,15 @@ async def run_metagpt(prompt_request: PromptRequest):
                 config["OPENROUTER_CONFIG"]["model_keys"] = {}
             
             # Get all model names from model_registry
-            models = []
-            try:
-                # Extract models from the MODEL_REGISTRY section
-                model_capabilities = config.get("MODEL_REGISTRY", {}).get("model_capabilities", {})
-                for capability_models in model_capabilities.values():
-                    models.extend(capability_models)
-                
-                # Add fallback models
-                fallback_models = config.get("MODEL_REGISTRY", {}).get("fallback_free_models", [])
-                models.extend(fallback_models)
-                
-                # Add default models
-                default_models = config.get("MODEL_REGISTRY", {}).get("default_models_by_task", {}).values()
-                for model_list in default_models:
-                    if isinstance(model_list, list):
-                        models.extend(model_list)
-                
-                # Remove duplicates
-                models = list(set(models))
-            except Exception as e:
-                logger.warning(f"Error extracting models from config: {str(e)}")
-                # Use hardcoded default models as fallback
-                models = [
-                    "deepseek/deepseek-chat-v3-0324:free",
-                    "meta-llama/llama-4-maverick:free",
-                    "google/gemini-2.5-pro-exp-03-25:free"
-                ]
+            models = _all_model_names(config_path, config_mtime)
             
             # Set the API key for each model
-            for model in models:
-                config["OPENROUTER_CONFIG"]["model_keys"][model] = api_key
+            config["OPENROUTER_CONFIG"]["model_keys"].update(dict.fromkeys(models, api_key))
         
         # Create the modified config file in the workspace
         modified_config_path = os.path.join(run_dir, "modified_config.yml")
         with open(modified_config_path, 'w') as f:
-            yaml.dump(config, f, default_flow_style=False)
+            yaml.dump(config, f, Dumper=SafeDumper, default_flow_style=False)
         
         logger.info(f"Created modified config with API key at: {modified_config_path}")
         
@@ -290,7 +414,11 @@ async def run_metagpt(prompt_request: PromptRequest):
             logger.error(f"Workflow file not found: {workflow_path}")
             # Try to list available workflows for debugging
             try:
-                available_workflows = os.listdir(workflows_dir)
+                with os.scandir(workflows_dir) as entries:
+                    available_workflows = [
+                        entry.name for entry in entries
+                        if entry.is_file() and entry.name.endswith(('.yml', '.yaml'))
+                    ]
                 logger.info(f"Available workflows: {available_workflows}")
             except Exception as e:
                 logger.error(f"Error listing workflows directory: {str(e)}")
@@ -304,98 +432,70 @@ async def run_metagpt(prompt_request: PromptRequest):
         workflow_filename = os.path.basename(workflow_path)
         workspace_workflow_path = os.path.join(workspace_workflows_dir, workflow_filename)
         try:
-            import shutil
-            shutil.copy2(workflow_path, workspace_workflow_path)
+            shutil.copyfile(workflow_path, workspace_workflow_path)
             logger.info(f"Copied workflow file to workspace: {workspace_workflow_path}")
         except Exception as e:
             logger.error(f"Error copying workflow file: {str(e)}")
             raise HTTPException(status_code=500, detail=f"Error copying workflow file: {str(e)}")
         
-        # Extract workflow name from the YAML file
-        try:
-            import yaml
-            with open(workspace_workflow_path, 'r') as f:
-                workflow_data = yaml.safe_load(f)
-                
-            if workflow_data and isinstance(workflow_data, dict):
-                # Look for a name field in the workflow file
-                workflow_name = None
-                if "name" in workflow_data:
-                    workflow_name = workflow_data["name"]
-                    logger.info(f"Found name in workflow file: {workflow_name}")
-                
-                # If no name field is found, use the filename without extension
-                if not workflow_name:
-                    workflow_name = os.path.basename(workspace_workflow_path).split('.')[0]
-                    logger.info(f"No name field found in workflow file, using filename: {workflow_name}")
-            else:
-                # If file is empty or invalid, fall back to using the filename
-                workflow_name = os.path.basename(workspace_workflow_path).split('.')[0]
-                logger.warning(f"Invalid or empty workflow file, using filename: {workflow_name}")
-                
-        except Exception as e:
-            # If file can't be read, fall back to using the filename
-            workflow_name = os.path.basename(workspace_workflow_path).split('.')[0]
-            logger.warning(f"Error reading workflow file, using name from filename: {workflow_name} (Error: {str(e)})")
-        
         # Write prompt to file
         input_file = os.path.join(run_dir, "input.txt")
-        with open(input_file, "w") as f:
-            f.write(prompt_request.prompt)
+        async with aiofiles.open(input_file, "w", buffering=FILE_BUFFER_SIZE) as f:
+            await f.write(prompt_request.prompt)
         
         # Run MetaGPT
         output_file = os.path.join(run_dir, "output.json")
         
         # Export the modified config path as an environment variable
         # This ensures the collaborative conversation module will use our config
-        os.environ["METAGPT_CONFIG_PATH"] = modified_config_path
+        job_env["METAGPT_CONFIG_PATH"] = modified_config_path
         logger.info(f"Set METAGPT_CONFIG_PATH to: {modified_config_path}")
         
-        # Run the workflow directly using subprocess
-        try:
-            import subprocess
-            import sys
-            
-            # Build command for executing run_collaborative.py
-            cmd = [
-                sys.executable, 
-                os.path.join(parent_dir, "run_collaborative.py"),
-                "--config", modified_config_path,
-                "--workflow", workspace_workflow_path,
-                "--input", input_file,
-                "--output", output_file
-            ]
-            
-            logger.info(f"Running command: {' '.join(cmd)}")
-            
-            # Execute the command with environment variables set
-            result = subprocess.run(cmd, check=True, capture_output=True, text=True, env=os.environ)
-            
-            # Log command output
-            if result.stdout:
-                logger.info(f"Command stdout:\n{result.stdout[:1000]}...")
-            
-            # Check if output file was created
-            if not os.path.exists(output_file):
-                raise HTTPException(status_code=500, detail="MetaGPT output.json not generated")
-                
-            # Load and return the result
-            with open(output_file, "r") as f:
-                result = json.load(f)
-            return {"status": "success", "result": result}
-            
-        except subprocess.CalledProcessError as e:
-            error_msg = f"MetaGPT execution failed with code {e.returncode}"
-            logger.error(error_msg)
-            if e.stdout:
-                logger.error(f"Command stdout:\n{e.stdout}")
-            if e.stderr:
-                logger.error(f"Command stderr:\n{e.stderr}")
-            raise HTTPException(status_code=500, detail=error_msg)
+        # Build command for executing run_collaborative.py
+        cmd = [
+            sys.executable, 
+            os.path.join(parent_dir, "run_collaborative.py"),
+            "--config", modified_config_path,
+            "--workflow", workspace_workflow_path,
+            "--input", input_file,
+            "--output", output_file
+        ]
+        
+        # Hand the run off to a background task and return immediately
+        await _write_job_status(run_dir, {"job_id": job_id, "status": "pending"})
+        log_path = os.path.join(workspace_logs_dir, "run.log")
+        task = asyncio.create_task(_run_job(job_id, cmd, run_dir, output_file, log_path, job_env))
+        JOBS[job_id] = task
+        task.add_done_callback(lambda _: JOBS.pop(job_id, None))
+        logger.info(f"Started MetaGPT job {job_id} in {run_dir}")
+        
+        return {
+            "status": "started",
+            "job_id": job_id,
+            "workspace_id": os.path.basename(run_dir)
+        }
+    except HTTPException:
+        raise
     except Exception as e:
         logger.exception(f"Unexpected error in run_metagpt: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Unexpected error: {str(e)}")
 
+@app.get("/api/run_metagpt/{job_id}")
+async def get_metagpt_job(job_id: str):
+    """Get the state (pending, running, done or failed) of a MetaGPT job."""
+    # Job ids are uuid4 hex strings; anything else cannot name a run directory
+    if not JOB_ID_RE.fullmatch(job_id):
+        raise HTTPException(status_code=404, detail=f"Job not found: {job_id}")
+    
+    try:
+        async with aiofiles.open(os.path.join(_job_run_dir(job_id), "status.json"), "rb", buffering=FILE_BUFFER_SIZE) as f:
+            return orjson.loads(await f.read())
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail=f"Job not found: {job_id}")
+    except Exception as e:
+        logger.error(f"Error reading status for job {job_id}: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Error reading job status: {str(e)}")
+
 
 @app.get("/health")
 async def health_check():
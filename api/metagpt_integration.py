@@ -5,6 +5,8 @@ import argparse
 import requests
 import logging
 from pathlib import Path
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -13,6 +15,30 @@ logger = logging.getLogger(__name__)
 # Default API URL (can be overridden with env var or command-line arg)
 API_URL = os.getenv("METAGPT_API_URL", "http://localhost:8000")
 
+# (connect, read) timeouts for API requests
+REQUEST_TIMEOUT = (3.05, 60)
+
+# Maximum number of bytes of an error response body to log
+MAX_ERROR_BODY = 512
+
+# Pooled HTTP session with retries on transient errors. Gateway statuses are only
+# retried for idempotent methods: a POST that got a 504 may still have created a
+# conversation, so for POST only connection failures are retried. Once retries run
+# out the last error response is returned rather than raised, so it gets logged.
+_SESSION = requests.Session()
+_ADAPTER = HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=16,
+    max_retries=Retry(
+        total=3,
+        backoff_factor=0.2,
+        status_forcelist=[502, 503, 504],
+        raise_on_status=False
+    )
+)
+_SESSION.mount("http://", _ADAPTER)
+_SESSION.mount("https://", _ADAPTER)
+
 def parse_arguments():
     parser = argparse.ArgumentParser(description="MetaGPT Rocket.Chat Integration Client")
     parser.add_argument(
@@ -38,9 +64,11 @@ def parse_arguments():
 def process_metagpt_output(args):
     """Send MetaGPT output to the API for processing (self-hosted chat UI)"""
     try:
-        # Check if file exists
-        input_path = Path(args.input).resolve()
-        if not input_path.exists():
+        # Check if file exists (a single stat, no symlink resolution)
+        input_path = Path(args.input)
+        try:
+            input_path.stat()
+        except FileNotFoundError:
             logger.error(f"Input file not found: {input_path}")
             return False
         
@@ -48,21 +76,28 @@ def process_metagpt_output(args):
         api_url = f"{args.api_url}/process_metagpt_output"
         
         logger.info(f"Sending output to API: {api_url}")
-        response = requests.post(
+        response = _SESSION.post(
             api_url,
             params={
                 "project_name": args.project,
-                "file_path": str(input_path) if input_path.is_absolute() else None
-            }
+                "file_path": str(input_path.absolute())
+            },
+            timeout=REQUEST_TIMEOUT,
+            stream=True
         )
         
-        if response.status_code == 200:
-            result = response.json()
-            logger.info(f"Success! Conversation created for project: {args.project}")
-            return True
-        else:
-            logger.error(f"API Error ({response.status_code}): {response.text}")
-            return False
+        try:
+            if response.status_code == 200:
+                result = response.json()
+                logger.info(f"Success! Conversation created for project: {args.project} ({result.get('path')})")
+                return True
+            else:
+                # Read only the start of the error body instead of buffering all of it
+                error_body = response.raw.read(MAX_ERROR_BODY, decode_content=True)
+                logger.error(f"API Error ({response.status_code}): {error_body.decode(errors='replace')}")
+                return False
+        finally:
+            response.close()
             
     except Exception as e:
         logger.error(f"Error processing MetaGPT output: {e}")
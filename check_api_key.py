@@ -8,6 +8,18 @@ import os
 import yaml
 import json
 from pathlib import Path
+from typing import Optional
+
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:  # libyaml not available
+    from yaml import SafeLoader
 
 # Load config to get default API key and potentially a default model
 CONFIG_PATH = Path(__file__).parent / "config.yml"
@@ -15,13 +27,26 @@ CONFIG = {}
 if CONFIG_PATH.exists():
     try:
         with open(CONFIG_PATH, 'r') as f:
-            CONFIG = yaml.safe_load(f)
+            CONFIG = yaml.load(f, Loader=SafeLoader) or {}
     except Exception as e:
         print(f"Warning: Could not load config.yml: {e}")
 
 OPENROUTER_CONFIG = CONFIG.get("OPENROUTER_CONFIG", {})
 DEFAULT_API_KEY = OPENROUTER_CONFIG.get("default_api_key")
 
+# Shared HTTP session so repeated checks reuse a kept-alive connection
+_SESSION: Optional[aiohttp.ClientSession] = None
+
+async def _get_session() -> aiohttp.ClientSession:
+    """Get the module-wide HTTP session, creating it on first use."""
+    global _SESSION
+    if _SESSION is None or _SESSION.closed:
+        _SESSION = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=32, keepalive_timeout=60, ttl_dns_cache=300),
+            headers={"Connection": "keep-alive"}
+        )
+    return _SESSION
+
 async def test_api_key(api_key):
     """Test a specific API key with a simple model.
     
@@ -41,7 +66,7 @@ async def test_api_key(api_key):
         "HTTP-Referer": "https://metagpt.com", # Optional: Helps OpenRouter identify traffic source
         "X-Title": "MetaGPT API Test" # Optional: Helps OpenRouter identify traffic source
     }
-    data = {
+    payload = {
         "model": test_model,
         "messages": [
             {"role": "user", "content": "Check API key status."}
@@ -50,55 +75,47 @@ async def test_api_key(api_key):
     }
     
     try:
-        async with aiohttp.ClientSession() as session:
-            async with session.post(url, 
-                                  json=payload, 
-                                  headers=headers, 
-                                  timeout=30) as response:
-                
-                status = response.status
-                body = await response.text()
-                
-                print(f"Status code: {status}")
-                
-                if status == 200:
-                    print("✅ SUCCESS! Your API key is working correctly.")
-                    try:
-                        json_response = json.loads(body)
-                        message = json_response.get("choices", [{}])[0].get("message", {}).get("content", "")
-                        print(f"Response: {message}")
-                    except:
-                        print("Could not parse JSON response")
-                else:
-                    print(f"❌ ERROR: {body}")
-                    print("\nYour API key does not appear to be working.")
-                    print("Please check the following:")
-                    print("1. The API key is correct and not expired")
-                    print("2. You have access to the models you're trying to use")
-                    print("3. Your account is in good standing")
+        session = await _get_session()
+        async with session.post(url, 
+                              json=payload, 
+                              headers=headers, 
+                              timeout=30) as response:
+            
+            status = response.status
+            body = await response.text()
+            
+            print(f"Status code: {status}")
+            
+            if status == 200:
+                print("✅ SUCCESS! Your API key is working correctly.")
+                try:
+                    json_response = _json_loads(body)
+                    message = json_response.get("choices", [{}])[0].get("message", {}).get("content", "")
+                    print(f"Response: {message}")
+                except:
+                    print("Could not parse JSON response")
+            else:
+                print(f"❌ ERROR: {body}")
+                print("\nYour API key does not appear to be working.")
+                print("Please check the following:")
+                print("1. The API key is correct and not expired")
+                print("2. You have access to the models you're trying to use")
+                print("3. Your account is in good standing")
     except Exception as e:
         print(f"❌ Request failed: {str(e)}")
 
 async def main():
-    # Check if API key is in environment variable
-    env_api_key = os.getenv("OPENROUTER_API_KEY")
-    
-    # Check if API key is in config file
-    config_path = "config.yml"
-    config_api_key = None
-    
-    if os.path.exists(config_path):
-        with open(config_path, 'r') as f:
-            config = yaml.safe_load(f)
-            config_api_key = config.get("OPENROUTER_API_KEY")
-    
     # Use environment variable or default key from config
     api_key = os.getenv("OPENROUTER_API_KEY") or DEFAULT_API_KEY
     if not api_key:
         print("Error: OPENROUTER_API_KEY environment variable not set and no default_api_key found in config.yml.")
         return
         
-    await test_api_key(api_key)
+    try:
+        await test_api_key(api_key)
+    finally:
+        if _SESSION is not None:
+            await _SESSION.close()
 
 if __name__ == "__main__":
     asyncio.run(main())
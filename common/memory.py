@@ -2,35 +2,85 @@
 # Enhanced memory system for context management between models
 
 import os
+import re
 import json
 import uuid
+import asyncio
+import base64
+import atexit
+import heapq
 import hashlib
-from typing import Dict, List, Any, Optional, Tuple
+import threading
+import weakref
+from collections import OrderedDict
+from typing import Dict, List, Any, Optional, Tuple, Union
 from datetime import datetime, timedelta
 import numpy as np
 from pathlib import Path
 
 try:
+    import torch
     from sentence_transformers import SentenceTransformer
     VECTOR_ENABLED = True
 except ImportError:
     VECTOR_ENABLED = False
     print("Warning: sentence_transformers not installed. Falling back to keyword-based retrieval.")
 
+try:
+    import orjson
+    def _json_dumps(obj: Any) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
+    _json_loads = orjson.loads
+except ImportError:
+    def _json_dumps(obj: Any) -> bytes:
+        return json.dumps(obj, separators=(',', ':')).encode()
+    _json_loads = json.loads
+
+# Embeddings are stored as float16 (half the memory of float32) and upcast for scoring
+EMBEDDING_STORAGE_DTYPE = np.float16
+
+# Keyword extraction for non-vector retrieval: words of 4+ characters minus common words
+_KEYWORD_RE = re.compile(r"\w{4,}")
+_COMMON_WORDS = frozenset({"the", "a", "an", "in", "on", "at", "to", "for", "with", "by", "from"})
+
+# Whitespace-separated words, used to find chunk boundaries in the original text
+_WORD_RE = re.compile(r"\S+")
+
+# Memory systems alive in this process. Held weakly so an instance and its embedding
+# model can be garbage collected; a single exit hook flushes whatever is left.
+_live_memories: "weakref.WeakSet" = weakref.WeakSet()
+
+@atexit.register
+def _flush_live_memories() -> None:
+    """Write any unsaved changes of live memory systems at interpreter exit."""
+    for memory in list(_live_memories):
+        memory.close()
+
+def _extract_keywords(text: str) -> frozenset:
+    """Extract keywords from text for non-vector retrieval.
+    
+    Args:
+        text: Text to extract keywords from
+        
+    Returns:
+        Set of keywords
+    """
+    return frozenset(word for word in _KEYWORD_RE.findall(text.lower()) if word not in _COMMON_WORDS)
+
 class MemoryChunk:
     """Represents a chunk of information stored in memory."""
     
     def __init__(self, 
                 text: str, 
                 metadata: Dict[str, Any],
-                embedding: Optional[List[float]] = None,
+                embedding: Optional[np.ndarray] = None,
                 expiry: Optional[datetime] = None):
         """Initialize a memory chunk.
         
         Args:
             text: Text content of the chunk
             metadata: Metadata about the chunk (source, timestamp, etc.)
-            embedding: Vector embedding of the chunk (if available)
+            embedding: Vector embedding of the chunk as a NumPy array (if available)
             expiry: Expiration time for this chunk (if applicable)
         """
         self.id = str(uuid.uuid4())
@@ -40,22 +90,16 @@ class MemoryChunk:
         self.created_at = datetime.now()
         self.expiry = expiry or (self.created_at + timedelta(days=1))
         
-        # Generate keywords for keyword-based retrieval fallback
-        self.keywords = self._extract_keywords(text)
-        
-    def _extract_keywords(self, text: str) -> List[str]:
-        """Extract keywords from text for non-vector retrieval.
+        # Keywords for keyword-based retrieval fallback, extracted on first use
+        # since chunks with an embedding never need them
+        self._keywords: Optional[frozenset] = None
         
-        Args:
-            text: Text to extract keywords from
-            
-        Returns:
-            List of keywords
-        """
-        # Simple keyword extraction - split by space and remove common words
-        common_words = {"the", "a", "an", "in", "on", "at", "to", "for", "with", "by", "from"}
-        words = text.lower().split()
-        return [word for word in words if word not in common_words and len(word) > 3]
+    @property
+    def keywords(self) -> frozenset:
+        """Keywords of the chunk text, extracted on first access."""
+        if self._keywords is None:
+            self._keywords = _extract_keywords(self.text)
+        return self._keywords
         
     def is_expired(self) -> bool:
         """Check if this chunk has expired.
@@ -65,20 +109,32 @@ class MemoryChunk:
         """
         return datetime.now() > self.expiry
     
-    def to_dict(self) -> Dict[str, Any]:
+    def to_dict(self, include_embedding: bool = True) -> Dict[str, Any]:
         """Convert to dictionary for serialization.
         
+        Args:
+            include_embedding: Whether to inline the embedding (False when it is
+                persisted separately in the embedding sidecar file)
+            
         Returns:
             Dictionary representation of the chunk
         """
-        return {
+        data = {
             "id": self.id,
             "text": self.text,
             "metadata": self.metadata,
             "created_at": self.created_at.isoformat(),
-            "expiry": self.expiry.isoformat(),
-            "keywords": self.keywords
+            "expiry": self.expiry.isoformat()
         }
+        if self._keywords is not None:
+            data["keywords"] = list(self._keywords)
+        if include_embedding and self.embedding is not None and len(self.embedding):
+            # Compact base64-encoded bytes instead of a JSON float list
+            data["embedding"] = base64.b64encode(
+                np.asarray(self.embedding, dtype=EMBEDDING_STORAGE_DTYPE).tobytes()
+            ).decode("ascii")
+            data["embedding_dtype"] = np.dtype(EMBEDDING_STORAGE_DTYPE).name
+        return data
     
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'MemoryChunk':
@@ -97,21 +153,34 @@ class MemoryChunk:
         chunk.id = data["id"]
         chunk.created_at = datetime.fromisoformat(data["created_at"])
         chunk.expiry = datetime.fromisoformat(data["expiry"])
-        chunk.keywords = data["keywords"]
+        if "keywords" in data:
+            chunk._keywords = frozenset(data["keywords"])
+        if data.get("embedding"):
+            chunk.embedding = np.frombuffer(
+                base64.b64decode(data["embedding"]),
+                dtype=data.get("embedding_dtype", "float16")
+            ).astype(np.float32)
         return chunk
 
 
 class ResultCache:
     """Cache for model outputs to avoid repeated API calls."""
     
-    def __init__(self, ttl_seconds: int = 3600):
+    def __init__(self, ttl_seconds: int = 3600, max_entries: int = 1024, sweep_interval: int = 128):
         """Initialize the result cache.
         
         Args:
             ttl_seconds: Time-to-live for cache entries in seconds
+            max_entries: Maximum number of entries kept; least recently used are evicted
+            sweep_interval: Number of set() calls between sweeps of expired entries
         """
-        self.cache = {}
+        self.cache = OrderedDict()
         self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.sweep_interval = sweep_interval
+        self._sets_since_sweep = 0
+        self.hits = 0
+        self.misses = 0
         
     def _generate_key(self, task: str, input_data: str) -> str:
         """Generate a unique key for the cache.
@@ -123,8 +192,13 @@ class ResultCache:
         Returns:
             Cache key
         """
-        content = f"{task}:{input_data}"
-        return hashlib.md5(content.encode()).hexdigest()
+        # BLAKE2b is faster than MD5; hash the parts incrementally to avoid
+        # building one large combined string for long inputs
+        h = hashlib.blake2b(digest_size=16)
+        h.update(task.encode())
+        h.update(b"\x1f")
+        h.update(input_data.encode())
+        return h.hexdigest()
         
     def get(self, task: str, input_data: str) -> Optional[str]:
         """Get cached result if available and not expired.
@@ -140,10 +214,13 @@ class ResultCache:
         if key in self.cache:
             entry = self.cache[key]
             if datetime.now() < entry["expiry"]:
+                self.cache.move_to_end(key)
+                self.hits += 1
                 return entry["result"]
             else:
                 # Clean up expired entry
                 del self.cache[key]
+        self.misses += 1
         return None
         
     def set(self, task: str, input_data: str, result: str) -> None:
@@ -160,10 +237,36 @@ class ResultCache:
             "result": result,
             "expiry": expiry
         }
+        self.cache.move_to_end(key)
+        
+        # Evict least recently used entries beyond the size bound
+        while len(self.cache) > self.max_entries:
+            self.cache.popitem(last=False)
+            
+        # Periodically drop expired entries that are never read again
+        self._sets_since_sweep += 1
+        if self._sets_since_sweep >= self.sweep_interval:
+            self._sets_since_sweep = 0
+            self._sweep_expired()
+            
+    def _sweep_expired(self) -> None:
+        """Remove all expired entries."""
+        now = datetime.now()
+        expired = [key for key, entry in self.cache.items() if entry["expiry"] <= now]
+        for key in expired:
+            del self.cache[key]
+            
+    def stats(self) -> Dict[str, int]:
+        """Get cache statistics.
+        
+        Returns:
+            Dictionary with entry count, hits and misses
+        """
+        return {"entries": len(self.cache), "hits": self.hits, "misses": self.misses}
         
     def clear(self) -> None:
         """Clear all cache entries."""
-        self.cache = {}
+        self.cache = OrderedDict()
 
 
 class EnhancedMemorySystem:
@@ -186,18 +289,44 @@ class EnhancedMemorySystem:
         
         # Initialize cache
         cache_config = config.get("cache", {})
-        self.cache = ResultCache(ttl_seconds=cache_config.get("ttl_seconds", 3600))
+        self.cache = ResultCache(
+            ttl_seconds=cache_config.get("ttl_seconds", 3600),
+            max_entries=cache_config.get("max_entries", 1024)
+        )
         
         # Initialize chunks storage
         self.chunks = []
         
+        # Min-heap of (expiry, chunk id) so expired chunks are found without a full scan
+        self._expiry_heap = []
+        
+        # Task name -> indices into self.chunks, so task-filtered queries only score that task
+        self._by_task = {}
+        
+        # LRU cache of query embeddings, keyed by a digest of the query text
+        self._query_embedding_cache = OrderedDict()
+        self._query_cache_size = self.vector_config.get("query_cache_size", 256)
+        
+        # Embedding matrix of unit-length rows kept row-aligned with self.chunks, so
+        # cosine similarity is a plain matrix-vector product. Rows for chunks without
+        # an embedding stay zero and are flagged False in _emb_valid.
+        self._emb_matrix = np.zeros((0, 0), dtype=EMBEDDING_STORAGE_DTYPE)
+        self._emb_valid = np.zeros(0, dtype=bool)
+        self._emb_count = 0
+        
         # Initialize vector model if available
         self.embedding_model = None
+        self.embed_batch_size = self.vector_config.get("embed_batch_size", 32)
         if VECTOR_ENABLED and self.vector_config.get("embedding_model"):
             try:
                 model_name = self.vector_config.get("embedding_model")
-                self.embedding_model = SentenceTransformer(model_name)
-                print(f"Initialized embedding model: {model_name}")
+                # Encode on GPU when available; CPU thread count can be tuned with embed_threads
+                device = self.vector_config.get("embed_device") or ("cuda" if torch.cuda.is_available() else "cpu")
+                embed_threads = self.vector_config.get("embed_threads")
+                if embed_threads:
+                    torch.set_num_threads(int(embed_threads))
+                self.embedding_model = SentenceTransformer(model_name, device=device)
+                print(f"Initialized embedding model: {model_name} on {device}")
             except Exception as e:
                 print(f"Error initializing embedding model: {str(e)}")
                 self.embedding_model = None
@@ -205,6 +334,15 @@ class EnhancedMemorySystem:
         # Create workspace directory if it doesn't exist
         os.makedirs(workspace_dir, exist_ok=True)
         
+        # Saves are debounced: changes mark memory dirty and a background timer
+        # flushes them, so bursts of add_document calls cost a single write.
+        # Call flush() (or close()) when the data must be on disk before continuing.
+        self.save_delay = config.get("save_delay_seconds", 1.0)
+        self._save_lock = threading.Lock()
+        self._save_timer = None
+        self._dirty = False
+        _live_memories.add(self)
+        
         # Load model context sizes from config, falling back to a default
         model_registry_config = config.get("MODEL_REGISTRY", {})
         self.model_context_sizes = model_registry_config.get("model_context_sizes", {})
@@ -222,36 +360,157 @@ class EnhancedMemorySystem:
         if not text:
             return []
             
-        words = text.split()
-        if len(words) <= self.chunk_size:
+        # Locate word boundaries once; each chunk is then a single slice of the text
+        starts = []
+        ends = []
+        for match in _WORD_RE.finditer(text):
+            starts.append(match.start())
+            ends.append(match.end())
+        num_words = len(starts)
+        if num_words <= self.chunk_size:
             return [text]
             
         chunks = []
-        for i in range(0, len(words), self.chunk_size - self.overlap):
-            chunk = " ".join(words[i:i + self.chunk_size])
-            chunks.append(chunk)
+        step = max(self.chunk_size - self.overlap, 1)
+        for i in range(0, num_words, step):
+            end = min(i + self.chunk_size, num_words)
+            chunks.append(text[starts[i]:ends[end - 1]])
+            # Stop at the window that reaches the end instead of emitting
+            # trailing windows already covered by it
+            if end == num_words:
+                break
             
         return chunks
         
-    def _create_embedding(self, text: str) -> Optional[List[float]]:
+    def _create_embedding(self, text: Union[str, List[str]]) -> Optional[np.ndarray]:
         """Create embedding for text if model is available.
         
         Args:
-            text: Text to create embedding for
+            text: Text to create embedding for, or a list of texts to encode in one batch
             
         Returns:
-            Embedding vector or None if not available
+            Unit-length float32 embedding vector (a 2-D array with one row per text
+            for a list) or None if not available
         """
         if not self.embedding_model:
             return None
             
         try:
-            embedding = self.embedding_model.encode(text)
-            return embedding.tolist()
+            if isinstance(text, str):
+                embedding = self.embedding_model.encode(text, convert_to_numpy=True, normalize_embeddings=True)
+                return embedding.astype(np.float32, copy=False)
+            if not text:
+                return np.zeros((0, 0), dtype=np.float32)
+            embeddings = self.embedding_model.encode(
+                text, batch_size=self.embed_batch_size, convert_to_numpy=True,
+                normalize_embeddings=True, show_progress_bar=False
+            )
+            return np.asarray(embeddings, dtype=np.float32)
         except Exception as e:
             print(f"Error creating embedding: {str(e)}")
             return None
             
+    def _get_query_embedding(self, query: str) -> Optional[np.ndarray]:
+        """Get the embedding for a query, reusing it if the query was seen recently.
+        
+        Args:
+            query: Query text
+            
+        Returns:
+            Embedding vector or None if not available
+        """
+        if not self.embedding_model:
+            return None
+            
+        key = hashlib.blake2b(query.encode(), digest_size=16).digest()
+        embedding = self._query_embedding_cache.get(key)
+        if embedding is not None:
+            self._query_embedding_cache.move_to_end(key)
+            return embedding
+            
+        embedding = self._create_embedding(query)
+        if embedding is not None:
+            self._query_embedding_cache[key] = embedding
+            while len(self._query_embedding_cache) > self._query_cache_size:
+                self._query_embedding_cache.popitem(last=False)
+        return embedding
+        
+    def _append_embeddings(self, embeddings: List[Optional[np.ndarray]]) -> None:
+        """Append embedding rows to the matrix, growing its capacity geometrically.
+        
+        Rows are normalized to unit length on insert, which also covers embeddings
+        loaded from memory saved before embeddings were normalized.
+        
+        Args:
+            embeddings: Embeddings of the chunks appended to self.chunks, in order
+        """
+        if not embeddings:
+            return
+            
+        dim = self._emb_matrix.shape[1]
+        if dim == 0:
+            dim = next((len(e) for e in embeddings if e is not None and len(e)), 0)
+            
+        needed = self._emb_count + len(embeddings)
+        if needed > self._emb_matrix.shape[0] or dim != self._emb_matrix.shape[1]:
+            capacity = max(needed, 2 * self._emb_matrix.shape[0], 16)
+            matrix = np.zeros((capacity, dim), dtype=EMBEDDING_STORAGE_DTYPE)
+            valid = np.zeros(capacity, dtype=bool)
+            if dim == self._emb_matrix.shape[1]:
+                matrix[:self._emb_count] = self._emb_matrix[:self._emb_count]
+                valid[:self._emb_count] = self._emb_valid[:self._emb_count]
+            self._emb_matrix = matrix
+            self._emb_valid = valid
+            
+        for row, embedding in enumerate(embeddings, start=self._emb_count):
+            if embedding is not None and len(embedding) == dim:
+                norm = np.linalg.norm(embedding)
+                if norm > 0:
+                    self._emb_matrix[row] = embedding / norm
+                    self._emb_valid[row] = True
+        self._emb_count = needed
+        
+    def _rebuild_task_index(self) -> None:
+        """Rebuild the task name -> chunk index mapping from self.chunks."""
+        self._by_task = {}
+        for i, chunk in enumerate(self.chunks):
+            self._by_task.setdefault(chunk.metadata.get("task"), []).append(i)
+            
+    def _rebuild_embedding_index(self) -> None:
+        """Rebuild the embedding matrix from self.chunks."""
+        self._emb_matrix = np.zeros((0, 0), dtype=EMBEDDING_STORAGE_DTYPE)
+        self._emb_valid = np.zeros(0, dtype=bool)
+        self._emb_count = 0
+        self._append_embeddings([chunk.embedding for chunk in self.chunks])
+            
+    def _store_chunks(self, new_chunks: List[MemoryChunk]) -> None:
+        """Drop expired chunks, append new ones and schedule a save.
+        
+        Args:
+            new_chunks: Chunks to add, with embeddings already computed
+        """
+        with self._save_lock:
+            # Remove expired chunks; the chunk list is only compacted when the
+            # earliest expiry has actually passed
+            now = datetime.now()
+            expired_ids = set()
+            while self._expiry_heap and self._expiry_heap[0][0] < now:
+                expired_ids.add(heapq.heappop(self._expiry_heap)[1])
+            if expired_ids:
+                self.chunks = [chunk for chunk in self.chunks if chunk.id not in expired_ids]
+                self._rebuild_embedding_index()
+                self._rebuild_task_index()
+                
+            for i, chunk in enumerate(new_chunks, start=len(self.chunks)):
+                self._by_task.setdefault(chunk.metadata.get("task"), []).append(i)
+            self.chunks.extend(new_chunks)
+            self._append_embeddings([chunk.embedding for chunk in new_chunks])
+            for chunk in new_chunks:
+                heapq.heappush(self._expiry_heap, (chunk.expiry, chunk.id))
+        
+        # Save memory to disk
+        self._save_memory()
+        
     def add_document(self, 
                     document: str, 
                     metadata: Dict[str, Any]) -> None:
@@ -263,37 +522,62 @@ class EnhancedMemorySystem:
         """
         chunks = self._split_text(document)
         
-        for chunk in chunks:
-            embedding = self._create_embedding(chunk)
-            memory_chunk = MemoryChunk(
-                text=chunk,
-                metadata=metadata,
-                embedding=embedding
-            )
-            self.chunks.append(memory_chunk)
-            
-        # Remove expired chunks
-        self.chunks = [chunk for chunk in self.chunks if not chunk.is_expired()]
+        # Encode all chunks in a single batch
+        embeddings = self._create_embedding(chunks)
+        if embeddings is None:
+            embeddings = [None] * len(chunks)
         
-        # Save memory to disk
-        self._save_memory()
+        self._store_chunks([
+            MemoryChunk(text=chunk, metadata=metadata, embedding=embedding)
+            for chunk, embedding in zip(chunks, embeddings)
+        ])
+        
+    async def add_documents(self, documents: List[Tuple[str, Dict[str, Any]]]) -> None:
+        """Add several documents to memory with one encode pass and one save.
+        
+        Encoding runs in a worker thread so the event loop is not blocked.
+        
+        Args:
+            documents: (document text, metadata) pairs
+        """
+        chunks = []
+        chunk_metadata = []
+        for document, metadata in documents:
+            for chunk in self._split_text(document):
+                chunks.append(chunk)
+                chunk_metadata.append(metadata)
+        if not chunks:
+            return
+            
+        embeddings = await asyncio.to_thread(self._create_embedding, chunks)
+        if embeddings is None:
+            embeddings = [None] * len(chunks)
             
-    def _cosine_similarity(self, vec1: List[float], vec2: List[float]) -> float:
+        self._store_chunks([
+            MemoryChunk(text=chunk, metadata=metadata, embedding=embedding)
+            for chunk, metadata, embedding in zip(chunks, chunk_metadata, embeddings)
+        ])
+            
+    def _cosine_similarity(self, 
+                          vec1: Optional[np.ndarray], 
+                          vec2: Optional[np.ndarray],
+                          normalized: bool = False) -> float:
         """Calculate cosine similarity between two vectors.
         
         Args:
             vec1: First vector
             vec2: Second vector
+            normalized: Whether both vectors are already unit length
             
         Returns:
             Cosine similarity (0-1)
         """
-        if not vec1 or not vec2:
+        if vec1 is None or vec2 is None or not len(vec1) or not len(vec2):
             return 0.0
             
-        vec1 = np.array(vec1)
-        vec2 = np.array(vec2)
-        
+        if normalized:
+            return float(np.dot(vec1, vec2))
+            
         dot_product = np.dot(vec1, vec2)
         norm1 = np.linalg.norm(vec1)
         norm2 = np.linalg.norm(vec2)
@@ -303,37 +587,23 @@ class EnhancedMemorySystem:
             
         return dot_product / (norm1 * norm2)
             
-    def _keyword_similarity(self, query: str, chunk: MemoryChunk) -> float:
+    def _keyword_similarity(self, query_keywords: frozenset, chunk: MemoryChunk) -> float:
         """Calculate keyword-based similarity as fallback.
         
         Args:
-            query: Query text
+            query_keywords: Keywords extracted from the query text
             chunk: Memory chunk
             
         Returns:
             Similarity score (0-1)
         """
-        query_keywords = set(self._extract_keywords(query))
-        chunk_keywords = set(chunk.keywords)
+        chunk_keywords = chunk.keywords
         
         if not query_keywords or not chunk_keywords:
             return 0.0
             
         intersection = query_keywords.intersection(chunk_keywords)
         return len(intersection) / max(len(query_keywords), len(chunk_keywords))
-    
-    def _extract_keywords(self, text: str) -> List[str]:
-        """Extract keywords from text.
-        
-        Args:
-            text: Text to extract keywords from
-            
-        Returns:
-            List of keywords
-        """
-        common_words = {"the", "a", "an", "in", "on", "at", "to", "for", "with", "by", "from"}
-        words = text.lower().split()
-        return [word for word in words if word not in common_words and len(word) > 3]
             
     def get_relevant_context(self, 
                            query: str, 
@@ -364,29 +634,54 @@ class EnhancedMemorySystem:
                 max_chunks = max(max_chunks, 5)
             # Default max_chunks remains as passed in for smaller contexts
             
-        query_embedding = self._create_embedding(query)
-        
-        # Calculate similarities
-        similarities = []
-        for chunk in self.chunks:
-            # Filter by task if specified
-            if task and chunk.metadata.get("task") != task:
-                continue
-                
-            # Use vector similarity if available
-            if query_embedding and chunk.embedding:
-                similarity = self._cosine_similarity(query_embedding, chunk.embedding)
-            else:
-                # Fall back to keyword similarity
-                similarity = self._keyword_similarity(query, chunk)
-                
-            similarities.append((chunk, similarity))
+        query_embedding = self._get_query_embedding(query)
+        
+        # Filter by task if specified
+        if task:
+            candidates = np.asarray(self._by_task.get(task, ()), dtype=np.intp)
+        else:
+            candidates = np.arange(len(self.chunks))
+        if candidates.size == 0:
+            return ""
+            
+        # Calculate similarities: rows and query are unit length, so one matrix-vector
+        # product gives cosine similarity for chunks with embeddings; keyword
+        # similarity is the fallback for the rest
+        similarities = np.zeros(candidates.size, dtype=np.float32)
+        has_vector = self._emb_valid[candidates]
+        query_vector = None
+        if query_embedding is not None:
+            query_vector = query_embedding
+            if query_vector.shape[0] != self._emb_matrix.shape[1]:
+                query_vector = None
+        if query_vector is not None:
+            rows = candidates[has_vector]
+            similarities[has_vector] = self._emb_matrix[rows].astype(np.float32, copy=False) @ query_vector
+        else:
+            has_vector[:] = False
+        fallback = np.flatnonzero(~has_vector)
+        if fallback.size:
+            query_keywords = _extract_keywords(query)
+            for i in fallback:
+                similarities[i] = self._keyword_similarity(query_keywords, self.chunks[candidates[i]])
             
-        # Sort by similarity (descending)
-        similarities.sort(key=lambda x: x[1], reverse=True)
+        # Select the top max_chunks in O(N), then order just those (descending)
+        k = min(max_chunks, similarities.size)
+        if k <= 0:
+            return ""
+        if k < similarities.size:
+            # Ties at the cut-off go to the earliest chunks, as with a stable sort
+            kth = -np.partition(-similarities, k - 1)[k - 1]
+            above = np.flatnonzero(similarities > kth)
+            tied = np.flatnonzero(similarities == kth)[:k - above.size]
+            order = np.concatenate((above, tied))
+        else:
+            order = np.arange(similarities.size)
+        order = order[np.lexsort((order, -similarities[order]))]
         
         # Take top chunks
-        top_chunks = [chunk for chunk, sim in similarities[:max_chunks] if sim > self.vector_config.get("similarity_threshold", 0.5)]
+        threshold = self.vector_config.get("similarity_threshold", 0.5)
+        top_chunks = [self.chunks[candidates[i]] for i in order if similarities[i] > threshold]
         
         # Combine chunks into context
         if not top_chunks:
@@ -396,32 +691,105 @@ class EnhancedMemorySystem:
         return context
     
     def _save_memory(self) -> None:
-        """Save memory to disk."""
-        memory_file = os.path.join(self.workspace_dir, "memory.json")
+        """Mark memory as changed and schedule a background save.
         
-        # Convert chunks to serializable form
-        serialized_chunks = [chunk.to_dict() for chunk in self.chunks]
+        The write happens on a timer thread save_delay seconds later, so memory.json
+        may lag behind recent changes until then; flush() writes immediately.
+        """
+        with self._save_lock:
+            self._dirty = True
+            if self._save_timer is None:
+                self._save_timer = threading.Timer(self.save_delay, self.flush)
+                self._save_timer.daemon = True
+                self._save_timer.start()
+                
+    def flush(self) -> None:
+        """Write memory to disk now if there are unsaved changes.
         
-        with open(memory_file, 'w') as f:
-            json.dump(serialized_chunks, f, indent=2)
+        Chunk metadata goes to a compact memory.json and the embedding matrix to a
+        row-aligned memory_emb.npy sidecar. Both are written to temporary files and
+        swapped in atomically so a memory-mapped sidecar is never truncated.
+        """
+        with self._save_lock:
+            if self._save_timer is not None:
+                self._save_timer.cancel()
+                self._save_timer = None
+            if not self._dirty:
+                return
+            self._dirty = False
+            
+            # Convert chunks to serializable form
+            serialized_chunks = [chunk.to_dict(include_embedding=False) for chunk in self.chunks]
+            embeddings = np.array(self._emb_matrix[:self._emb_count])
+            
+        memory_file = os.path.join(self.workspace_dir, "memory.json")
+        embedding_file = os.path.join(self.workspace_dir, "memory_emb.npy")
+        try:
+            with open(memory_file + ".tmp", 'wb') as f:
+                f.write(_json_dumps(serialized_chunks))
+            with open(embedding_file + ".tmp", 'wb') as f:
+                np.save(f, embeddings)
+            os.replace(embedding_file + ".tmp", embedding_file)
+            os.replace(memory_file + ".tmp", memory_file)
+        except Exception as e:
+            print(f"Error saving memory: {str(e)}")
+            
+    def close(self) -> None:
+        """Write pending changes and stop tracking this memory system for exit flushing."""
+        self.flush()
+        _live_memories.discard(self)
             
     def _load_memory(self) -> None:
         """Load memory from disk if available."""
         memory_file = os.path.join(self.workspace_dir, "memory.json")
+        embedding_file = os.path.join(self.workspace_dir, "memory_emb.npy")
         
         if not os.path.exists(memory_file):
             return
             
         try:
-            with open(memory_file, 'r') as f:
-                serialized_chunks = json.load(f)
+            with open(memory_file, 'rb') as f:
+                serialized_chunks = _json_loads(f.read())
                 
             self.chunks = [MemoryChunk.from_dict(data) for data in serialized_chunks]
+            self._expiry_heap = [(chunk.expiry, chunk.id) for chunk in self.chunks]
+            heapq.heapify(self._expiry_heap)
+            self._rebuild_task_index()
+            
+            # Memory-map the embedding sidecar so rows are paged in lazily
+            embeddings = None
+            if os.path.exists(embedding_file):
+                embeddings = np.load(embedding_file, mmap_mode='r')
+                if embeddings.ndim != 2 or embeddings.shape[0] != len(self.chunks):
+                    print("Warning: embedding sidecar does not match memory.json, ignoring it")
+                    embeddings = None
+            if embeddings is not None:
+                norms = np.linalg.norm(embeddings.astype(np.float32), axis=1)
+                for chunk, row, norm in zip(self.chunks, embeddings, norms):
+                    if norm > 0:
+                        chunk.embedding = row
             
             # Re-compute embeddings if model is available
+            missing = []
             if self.embedding_model:
-                for chunk in self.chunks:
-                    if not chunk.embedding:
-                        chunk.embedding = self._create_embedding(chunk.text)
+                missing = [chunk for chunk in self.chunks
+                           if chunk.embedding is None or not len(chunk.embedding)]
+                new_embeddings = self._create_embedding([chunk.text for chunk in missing])
+                if new_embeddings is None:
+                    new_embeddings = []
+                for chunk, embedding in zip(missing, new_embeddings):
+                    chunk.embedding = embedding
+                    
+            # Sidecars written before embeddings were normalized are rebuilt, which
+            # re-normalizes their rows
+            if (embeddings is not None and not missing
+                    and embeddings.dtype == EMBEDDING_STORAGE_DTYPE
+                    and np.allclose(norms[norms > 0], 1.0, atol=1e-2)):
+                # Use the memory-mapped matrix as is; it is copied on the next append
+                self._emb_matrix = embeddings
+                self._emb_valid = norms > 0
+                self._emb_count = len(self.chunks)
+            else:
+                self._rebuild_embedding_index()
         except Exception as e:
             print(f"Error loading memory: {str(e)}")
@@ -2,16 +2,92 @@
 # config_cli.py
 # Command line interface for managing dynamic configurations
 
+from __future__ import annotations
+
 import os
 import sys
+import json
 import argparse
 import asyncio
-import yaml
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, TYPE_CHECKING
 from pathlib import Path
 
-from config_manager import DynamicConfigManager, RoleManager, WorkflowManager
+try:
+    import orjson
+    def _json_dumps(obj: Any) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    _json_loads = orjson.loads
+except ImportError:
+    def _json_dumps(obj: Any) -> bytes:
+        return json.dumps(obj, indent=2).encode()
+    _json_loads = json.loads
+
+# yaml and config_manager are imported on first use so that --help and
+# argument errors do not pay for them
+if TYPE_CHECKING:
+    from config_manager import DynamicConfigManager, RoleManager, WorkflowManager
+
+# Write buffer for exported YAML files
+FILE_BUFFER_SIZE = 64 * 1024
+
+_yaml = None
+
+def _get_yaml():
+    """Import PyYAML once, preferring the libyaml-backed loader and dumper.
+    
+    Returns:
+        Tuple of (yaml module, SafeLoader, SafeDumper)
+    """
+    global _yaml
+    if _yaml is None:
+        import yaml
+        try:
+            from yaml import CSafeLoader as SafeLoader, CSafeDumper as SafeDumper
+        except ImportError:  # libyaml not available
+            from yaml import SafeLoader, SafeDumper
+        _yaml = (yaml, SafeLoader, SafeDumper)
+    return _yaml
+
+def _load_file(path) -> Any:
+    """Parse a YAML file, or a JSON file when the suffix is .json (blocking; run it
+    through asyncio.to_thread).
+    
+    Args:
+        path: Path to the file
+        
+    Returns:
+        Parsed data
+    """
+    with open(path, 'rb') as f:
+        if Path(path).suffix.lower() == ".json":
+            return _json_loads(f.read())
+        yaml, SafeLoader, _ = _get_yaml()
+        return yaml.load(f, Loader=SafeLoader)
+
+def _dump_file(path, data: Any) -> None:
+    """Write data as YAML, or as JSON when the suffix is .json (blocking; run it
+    through asyncio.to_thread).
+    
+    Args:
+        path: Path to the output file
+        data: Data to serialize
+    """
+    with open(path, 'wb', buffering=FILE_BUFFER_SIZE) as f:
+        if Path(path).suffix.lower() == ".json":
+            f.write(_json_dumps(data))
+            return
+        yaml, _, SafeDumper = _get_yaml()
+        yaml.dump(data, f, Dumper=SafeDumper, encoding='utf-8', default_flow_style=False, sort_keys=False)
+
+# Shown in list_models for models without a description
+DEFAULT_DESCRIPTION = "No description"
+
+def needs_models(func):
+    """Mark a command handler as needing the OpenRouter model list to be loaded."""
+    func.needs_models = True
+    return func
 
+@needs_models
 async def list_models(config_manager: DynamicConfigManager) -> None:
     """List available models from OpenRouter.
     
@@ -21,29 +97,36 @@ async def list_models(config_manager: DynamicConfigManager) -> None:
     print("Fetching available models from OpenRouter...")
     
     try:
+        registry = config_manager.model_registry
+        
         # Fetch models if not already fetched
-        if not config_manager.model_registry.available_models:
-            await config_manager.model_registry.fetch_available_models()
+        if not registry.available_models:
+            await registry.fetch_available_models()
             
         # Get models
-        all_models = config_manager.model_registry.available_models
-        free_models = config_manager.model_registry.free_models
+        all_models = registry.available_models
+        free_models = registry.free_models
         
         print(f"\n{'=' * 60}")
         print(f"Found {len(all_models)} total models")
         print(f"Found {len(free_models)} free models")
         print(f"{'=' * 60}")
         
-        # Display free models
-        print("\nFree Models:")
+        # Display free models, collected into one write instead of a print per line
+        separator = '=' * 60
+        lines = ["\nFree Models:"]
         for i, (model_id, model_data) in enumerate(free_models.items(), 1):
             context_length = model_data.get("context_length", "Unknown")
-            description = model_data.get("description", "No description")
+            description = model_data.get("description") or DEFAULT_DESCRIPTION
+            if len(description) > 100:
+                description = description[:100]
             
-            print(f"{i}. {model_id}")
-            print(f"   Context length: {context_length}")
-            print(f"   Description: {description[:100]}...")
-            print(f"{'=' * 60}")
+            lines.append(f"{i}. {model_id}\n"
+                         f"   Context length: {context_length}\n"
+                         f"   Description: {description}...\n"
+                         f"{separator}")
+        sys.stdout.write("\n".join(lines) + "\n")
+        sys.stdout.flush()
         
     except Exception as e:
         print(f"Error fetching models: {str(e)}")
@@ -56,20 +139,22 @@ async def list_roles(config_manager: DynamicConfigManager) -> None:
     """
     roles = config_manager.role_manager.list_roles()
     
-    print("\nBuilt-in Roles:")
+    lines = ["\nBuilt-in Roles:"]
     for role in roles["builtin"]:
         role_data = config_manager.role_manager.get_role(role)
-        print(f"- {role}: {role_data.get('name', role)}")
-        print(f"  {role_data.get('description', '')}")
+        lines.append(f"- {role}: {role_data.get('name', role)}")
+        lines.append(f"  {role_data.get('description', '')}")
     
     if roles["custom"]:
-        print("\nCustom Roles:")
+        lines.append("\nCustom Roles:")
         for role in roles["custom"]:
             role_data = config_manager.role_manager.get_role(role)
-            print(f"- {role}: {role_data.get('name', role)}")
-            print(f"  {role_data.get('description', '')}")
+            lines.append(f"- {role}: {role_data.get('name', role)}")
+            lines.append(f"  {role_data.get('description', '')}")
     else:
-        print("\nNo custom roles defined.")
+        lines.append("\nNo custom roles defined.")
+    sys.stdout.write("\n".join(lines) + "\n")
+    sys.stdout.flush()
 
 async def list_workflows(config_manager: DynamicConfigManager) -> None:
     """List available workflows.
@@ -79,11 +164,13 @@ async def list_workflows(config_manager: DynamicConfigManager) -> None:
     """
     workflows = config_manager.workflow_manager.list_workflows()
     
-    print("\nAvailable Workflows:")
+    lines = ["\nAvailable Workflows:"]
     for workflow in workflows:
-        print(f"- {workflow['name']}: {workflow['display_name']}")
-        print(f"  {workflow['description']}")
-        print(f"  Stages: {workflow['stages']}")
+        lines.append(f"- {workflow['name']}: {workflow['display_name']}")
+        lines.append(f"  {workflow['description']}")
+        lines.append(f"  Stages: {workflow['stages']}")
+    sys.stdout.write("\n".join(lines) + "\n")
+    sys.stdout.flush()
 
 async def export_role(config_manager: DynamicConfigManager, role_name: str, output_file: str) -> None:
     """Export role definition to file.
@@ -99,8 +186,7 @@ async def export_role(config_manager: DynamicConfigManager, role_name: str, outp
         return
     
     try:
-        with open(output_file, 'w') as f:
-            yaml.dump(role_data, f, default_flow_style=False)
+        await asyncio.to_thread(_dump_file, output_file, role_data)
         print(f"Role '{role_name}' exported to {output_file}")
     except Exception as e:
         print(f"Error exporting role: {str(e)}")
@@ -114,8 +200,7 @@ async def import_role(config_manager: DynamicConfigManager, role_name: str, inpu
         input_file: Path to input file
     """
     try:
-        with open(input_file, 'r') as f:
-            role_data = yaml.safe_load(f)
+        role_data = await asyncio.to_thread(_load_file, input_file)
             
         if config_manager.role_manager.create_role(role_name, role_data):
             print(f"Role '{role_name}' imported successfully")
@@ -138,8 +223,7 @@ async def export_workflow(config_manager: DynamicConfigManager, workflow_name: s
         return
     
     try:
-        with open(output_file, 'w') as f:
-            yaml.dump(workflow_data, f, default_flow_style=False)
+        await asyncio.to_thread(_dump_file, output_file, workflow_data)
         print(f"Workflow '{workflow_name}' exported to {output_file}")
     except Exception as e:
         print(f"Error exporting workflow: {str(e)}")
@@ -153,8 +237,7 @@ async def import_workflow(config_manager: DynamicConfigManager, workflow_name: s
         input_file: Path to input file
     """
     try:
-        with open(input_file, 'r') as f:
-            workflow_data = yaml.safe_load(f)
+        workflow_data = await asyncio.to_thread(_load_file, input_file)
             
         if config_manager.workflow_manager.create_workflow(workflow_name, workflow_data):
             print(f"Workflow '{workflow_name}' imported successfully")
@@ -163,6 +246,7 @@ async def import_workflow(config_manager: DynamicConfigManager, workflow_name: s
     except Exception as e:
         print(f"Error importing workflow: {str(e)}")
 
+@needs_models
 async def update_config_from_models(config_manager: DynamicConfigManager) -> None:
     """Update configuration with available models.
     
@@ -174,11 +258,17 @@ async def update_config_from_models(config_manager: DynamicConfigManager) -> Non
     try:
         new_config = await config_manager.generate_config_from_available_models()
         
-        # Save new config
-        with open(config_manager.config_path, 'w') as f:
-            yaml.dump(new_config, f, default_flow_style=False)
-            
-        print(f"Configuration updated and saved to {config_manager.config_path}")
+        # Merge only the sections that changed into the already loaded config,
+        # and skip the write entirely when nothing did
+        changed = {section: value for section, value in new_config.items()
+                   if config_manager.config.get(section) != value}
+        if changed:
+            merged_config = {**config_manager.config, **changed}
+            await asyncio.to_thread(_dump_file, config_manager.config_path, merged_config)
+            config_manager.config = merged_config
+            print(f"Configuration updated and saved to {config_manager.config_path}")
+        else:
+            print(f"Configuration at {config_manager.config_path} is already up to date")
         
         # Show updated model assignments
         print("\nUpdated Task-Model Assignments:")
@@ -204,9 +294,9 @@ async def set_workflow(config_manager: DynamicConfigManager, workflow_name: str)
         
         # Show workflow stages
         workflow_stages = config_manager.get_workflow_stages(workflow_name)
-        print("\nWorkflow Stages:")
-        for i, stage in enumerate(workflow_stages, 1):
-            print(f"{i}. {stage.get('task')} → {stage.get('output')}")
+        lines = [f"{i}. {stage.get('task')} → {stage.get('output')}"
+                 for i, stage in enumerate(workflow_stages, 1)]
+        print("\nWorkflow Stages:\n" + "\n".join(lines))
     else:
         print(f"Error: Could not set workflow to '{workflow_name}'")
 
@@ -226,8 +316,7 @@ async def create_custom_role(config_manager: DynamicConfigManager,
     """
     try:
         # Read system prompt from file
-        with open(system_prompt_file, 'r') as f:
-            system_prompt = f.read()
+        system_prompt = (await asyncio.to_thread(Path(system_prompt_file).read_bytes)).decode('utf-8')
             
         role_data = {
             "name": display_name,
@@ -268,8 +357,7 @@ async def create_custom_workflow(config_manager: DynamicConfigManager,
     """
     try:
         # Read stages from file
-        with open(stages_file, 'r') as f:
-            stages_data = yaml.safe_load(f)
+        stages_data = await asyncio.to_thread(_load_file, stages_file)
             
         if not isinstance(stages_data, list):
             print("Error: Stages file must contain a list of stage dictionaries")
@@ -288,7 +376,29 @@ async def create_custom_workflow(config_manager: DynamicConfigManager,
     except Exception as e:
         print(f"Error creating custom workflow: {str(e)}")
 
-async def main():
+# Command name -> (handler, function extracting the handler's arguments from the parsed args)
+COMMANDS = {
+    "list-models": (list_models, lambda args: ()),
+    "list-roles": (list_roles, lambda args: ()),
+    "list-workflows": (list_workflows, lambda args: ()),
+    "export-role": (export_role, lambda args: (args.role, args.output)),
+    "import-role": (import_role, lambda args: (args.role, args.input)),
+    "export-workflow": (export_workflow, lambda args: (args.workflow, args.output)),
+    "import-workflow": (import_workflow, lambda args: (args.workflow, args.input)),
+    "update-config": (update_config_from_models, lambda args: ()),
+    "set-workflow": (set_workflow, lambda args: (args.workflow,)),
+    "create-role": (create_custom_role,
+                    lambda args: (args.name, args.display_name, args.description, args.prompt_file)),
+    "create-workflow": (create_custom_workflow,
+                        lambda args: (args.name, args.display_name, args.description, args.stages_file)),
+}
+
+def _build_parser() -> argparse.ArgumentParser:
+    """Build the command line argument parser.
+    
+    Returns:
+        Configured argument parser
+    """
     parser = argparse.ArgumentParser(description="Dynamic Configuration Manager")
     subparsers = parser.add_subparsers(dest="command", help="Command to run")
     
@@ -345,39 +455,33 @@ async def main():
     create_workflow_parser.add_argument("--description", required=True, help="Description of the workflow")
     create_workflow_parser.add_argument("--stages-file", required=True, help="Path to file containing workflow stages")
     
-    args = parser.parse_args()
+    return parser
+
+# Built once per process and reused by every main() call
+_PARSER = _build_parser()
+
+async def main():
+    args = _PARSER.parse_args()
     
     if not args.command:
-        parser.print_help()
+        _PARSER.print_help()
         return
     
     # Initialize configuration manager
+    from config_manager import DynamicConfigManager
     config_manager = DynamicConfigManager(args.config)
-    await config_manager.initialize()
-    
-    # Run the appropriate command
-    if args.command == "list-models":
-        await list_models(config_manager)
-    elif args.command == "list-roles":
-        await list_roles(config_manager)
-    elif args.command == "list-workflows":
-        await list_workflows(config_manager)
-    elif args.command == "export-role":
-        await export_role(config_manager, args.role, args.output)
-    elif args.command == "import-role":
-        await import_role(config_manager, args.role, args.input)
-    elif args.command == "export-workflow":
-        await export_workflow(config_manager, args.workflow, args.output)
-    elif args.command == "import-workflow":
-        await import_workflow(config_manager, args.workflow, args.input)
-    elif args.command == "update-config":
-        await update_config_from_models(config_manager)
-    elif args.command == "set-workflow":
-        await set_workflow(config_manager, args.workflow)
-    elif args.command == "create-role":
-        await create_custom_role(config_manager, args.name, args.display_name, args.description, args.prompt_file)
-    elif args.command == "create-workflow":
-        await create_custom_workflow(config_manager, args.name, args.display_name, args.description, args.stages_file)
+    await config_manager.initialize(fetch_models=False)
+    
+    try:
+        # Only commands that use the model list pay for loading it
+        command, command_args = COMMANDS[args.command]
+        if getattr(command, "needs_models", False):
+            await config_manager.model_registry.fetch_available_models()
+        
+        # Run the appropriate command
+        await command(config_manager, *command_args(args))
+    finally:
+        await config_manager.aclose()
 
 if __name__ == "__main__":
     asyncio.run(main())
\ No newline at end of file
@@ -2,25 +2,82 @@
 # Enhanced dynamic configuration system for model roles and workflow
 
 import os
+import time
+import logging
+import random
+import asyncio
 import yaml
 import json
+import heapq
+import itertools
+import hashlib
+import operator
 import aiohttp
-from typing import Dict, List, Any, Optional, Tuple
+from types import MappingProxyType
+from typing import Dict, List, Any, Mapping, Optional, Tuple
 from pathlib import Path
 
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:  # libyaml not available
+    from yaml import SafeLoader
+
+# Optional faster JSON for the /models payload and its disk cache
+try:
+    import orjson
+    _json_dumps = orjson.dumps
+    _json_loads = orjson.loads
+except ImportError:
+    def _json_dumps(obj: Any) -> bytes:
+        return json.dumps(obj, separators=(',', ':')).encode()
+    _json_loads = json.loads
+
+def _load_yaml_file(path: Path) -> Any:
+    """Parse a YAML file with the fastest available safe loader.
+    
+    Args:
+        path: Path to the YAML file
+        
+    Returns:
+        Parsed YAML content
+    """
+    with open(path, 'r') as f:
+        return yaml.load(f, Loader=SafeLoader)
+
+logger = logging.getLogger(__name__)
+
 # Load the main configuration file once
 CONFIG_PATH = Path(__file__).parent / "config.yml"
 CONFIG = {}
 if CONFIG_PATH.exists():
     try:
-        with open(CONFIG_PATH, 'r') as f:
-            CONFIG = yaml.safe_load(f)
+        CONFIG = _load_yaml_file(CONFIG_PATH)
     except Exception as e:
-        print(f"Warning: Could not load config.yml: {e}")
+        logger.warning("Could not load config.yml: %s", e)
+
+# Primary/backup used when the config has no 'default' entry in default_models_by_task;
+# a sensible, widely available free default
+DEFAULT_MODEL_PAIR = ("google/gemini-flash-1.5:free", "google/gemini-flash-1.5:free")
+
+# On-disk cache of the OpenRouter /models response, shared across processes
+MODELS_CACHE_PATH = Path(os.getenv("XDG_CACHE_HOME") or Path.home() / ".cache") / "free-models-metagpt" / "models.json"
+MODELS_CACHE_TTL = 6 * 3600
+
+# Retry policy for the /models request: attempts, first backoff delay (x4 per retry),
+# longest Retry-After honoured and the per-attempt timeout, in seconds
+MODELS_FETCH_ATTEMPTS = 3
+MODELS_FETCH_BACKOFF = 0.25
+MODELS_FETCH_MAX_RETRY_AFTER = 30
+MODELS_FETCH_TIMEOUT = 10
+RETRYABLE_STATUSES = frozenset({429, 500, 502, 503, 504})
 
 class ModelRegistry:
     """Registry for managing and retrieving available OpenRouter models."""
     
+    # In-flight /models requests keyed by (API key, URL) digest, shared by all
+    # registries so concurrent fetches issue a single HTTP request
+    _inflight: Dict[str, asyncio.Task] = {}
+    
     def __init__(self, api_key: Optional[str] = None, config: Optional[Dict[str, Any]] = None):
         """Initialize the model registry.
         
@@ -28,97 +85,307 @@ class ModelRegistry:
             api_key: OpenRouter API key (overrides config and env var)
             config: Loaded configuration dictionary (e.g., from config.yml)
         """
+        # Fall back to the module-level config when none (or an empty one) is given
+        cfg = config or CONFIG
+        
         # API Key precedence: provided api_key > config > environment variable
-        openrouter_config = config.get("OPENROUTER_CONFIG", {}) if config else CONFIG.get("OPENROUTER_CONFIG", {})
+        openrouter_config = cfg.get("OPENROUTER_CONFIG", {})
         self.api_key = api_key or openrouter_config.get("default_api_key") or os.getenv("OPENROUTER_API_KEY")
         self.model_keys = openrouter_config.get("model_keys", {})
 
-        self.available_models = {}
-        self.free_models = {}
+        # Written only through the private dicts; callers get read-only views so
+        # they cannot change the models behind the ranking cache
+        self._available_models: Dict[str, Any] = {}
+        self._free_models: Dict[str, Any] = {}
+        
+        # Ranking results cached per (task, free_only); cleared whenever the
+        # model dicts are replaced
+        self._best_model_cache: Dict[Tuple[str, bool], Tuple[str, str]] = {}
+        
+        # HTTP session reused across fetches, created on first use
+        self._session: Optional[aiohttp.ClientSession] = None
 
         # Load model registry settings from config
-        model_registry_config = config.get("MODEL_REGISTRY", {}) if config else CONFIG.get("MODEL_REGISTRY", {})
+        model_registry_config = cfg.get("MODEL_REGISTRY", {})
         self.model_capabilities = model_registry_config.get("model_capabilities", {})
         self.fallback_free_models_list = model_registry_config.get("fallback_free_models", [])
         self.default_models_by_task = model_registry_config.get("default_models_by_task", {})
+        self.models_cache_ttl = model_registry_config.get("models_cache_ttl", MODELS_CACHE_TTL)
+        # Fetch time of the models currently held, 0 until a fetch succeeds
+        self._models_fetched_at = 0.0
+        # Number of model fetches in progress; rankings are refused meanwhile
+        # rather than computed from an empty model list
+        self._fetches_pending = 0
+        
+        # Per task, capability -> rank score (first listed scores highest), so
+        # ranking does a dict lookup per model instead of scanning the list
+        self._capability_rank: Dict[str, Dict[str, int]] = {}
+        for task_name, capabilities in self.model_capabilities.items():
+            ranks = self._capability_rank[task_name] = {}
+            for i, capability in enumerate(capabilities):
+                ranks.setdefault(capability, len(capabilities) - i)
+        
+        # Parallel id / base id (without the ':free' style suffix) / context_length
+        # lists mirroring the model dicts, rebuilt by _models_changed, so ranking
+        # iterates flat lists instead of dicts
+        self._free_ids: List[str] = []
+        self._free_bases: List[str] = []
+        self._free_ctx: List[int] = []
+        self._available_ids: List[str] = []
+        self._available_bases: List[str] = []
+        self._available_ctx: List[int] = []
         # Ensure a basic default exists if config is missing the 'default' key
-        if "default" not in self.default_models_by_task:
-            self.default_models_by_task["default"] = ["google/gemini-flash-1.5:free", "google/gemini-flash-1.5:free"] # A sensible, widely available free default
+        self.default_models_by_task.setdefault("default", list(DEFAULT_MODEL_PAIR))
         
     # This patch should be applied to the ModelRegistry class in config_manager.py
 
-    async def fetch_available_models(self) -> Dict[str, Any]:
-        """Fetch available models from OpenRouter API.
+    def _api_key_hash(self) -> str:
+        """Fingerprint of the API key, so a cache written for another key is not reused."""
+        return hashlib.sha256((self.api_key or "").encode()).hexdigest()[:16]
+        
+    def _load_cached_models(self) -> Optional[Tuple[float, Dict[str, Any]]]:
+        """Load the cached /models response if it is fresh and was fetched with this API key.
+        
+        Returns:
+            Tuple of (fetch time, response data) or None if there is no usable cache
+        """
+        try:
+            mtime = MODELS_CACHE_PATH.stat().st_mtime
+            if time.time() - mtime >= self.models_cache_ttl:
+                return None
+            with open(MODELS_CACHE_PATH, 'rb') as f:
+                cached = _json_loads(f.read())
+            if cached.get("api_key_hash") != self._api_key_hash():
+                return None
+            return cached.get("fetched_at", mtime), cached["data"]
+        except (OSError, ValueError, KeyError, AttributeError):
+            return None
+            
+    def _save_cached_models(self, data: Dict[str, Any]) -> None:
+        """Atomically write the /models response to the disk cache.
+        
+        Args:
+            data: Response data from the OpenRouter API
+        """
+        try:
+            MODELS_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = MODELS_CACHE_PATH.with_suffix(".tmp")
+            with open(tmp_path, 'wb') as f:
+                f.write(_json_dumps({
+                    "fetched_at": time.time(),
+                    "api_key_hash": self._api_key_hash(),
+                    "data": data
+                }))
+            os.replace(tmp_path, MODELS_CACHE_PATH)
+        except OSError as e:
+            logger.warning("Could not write model cache: %s", e)
+            
+    def _process_models_data(self, data: Dict[str, Any]) -> Mapping[str, Any]:
+        """Populate available and free models from a /models response.
+        
+        Args:
+            data: Response data from the OpenRouter API
+            
+        Returns:
+            Dictionary of available models
+        """
+        # Organize models by ID and pick out free models (':free' suffix) in one pass
+        self._available_models = {}
+        self._free_models = {}
+        for model in data.get("data", ()):
+            model_id = model.get("id")
+            if not model_id:
+                continue
+            self._available_models[model_id] = model
+            if model_id.endswith(':free'):
+                self._free_models[model_id] = model
+        
+        # If no free models detected, use fallback free models from config
+        if not self._free_models:
+            logger.warning("No free models detected from API. Using fallback list from config.")
+            self._use_fallback_free_models(check_available=True)
+        else:
+            # Ensure the models from config are included in free_models
+            # This ensures models explicitly configured in config.yml are always available
+            for model_id in self.fallback_free_models_list:
+                self._free_models.setdefault(model_id, {
+                    "id": model_id,
+                    "context_length": 8000, 
+                    "description": "Added from config.yml free model list"
+                })
+        
+        self._models_changed()
+        logger.info("Found %d total models", len(self._available_models))
+        logger.info("Found %d free models", len(self._free_models))
+        
+        return self.available_models
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """Get the registry's HTTP session, creating it on first use."""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=32, ttl_dns_cache=300, keepalive_timeout=60),
+                timeout=aiohttp.ClientTimeout(total=15)
+            )
+        return self._session
+        
+    async def aclose(self) -> None:
+        """Close the registry's HTTP session."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+        
+    async def __aenter__(self) -> "ModelRegistry":
+        return self
+        
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.aclose()
+        
+    async def _request_models(self, url: str) -> Optional[Dict[str, Any]]:
+        """Request the model list from OpenRouter and cache a successful response.
+        
+        Args:
+            url: OpenRouter /models endpoint
+            
+        Returns:
+            Response data or None if the API returned an error status
+            
+        Transient failures (timeouts, connection errors, 429 and 5xx responses) are
+        retried with exponential backoff; the last failure is raised or reported.
+        """
+        headers = {"Authorization": f"Bearer {self.api_key}"}
+        session = await self._get_session()
+        timeout = aiohttp.ClientTimeout(total=MODELS_FETCH_TIMEOUT)
+        last_attempt = MODELS_FETCH_ATTEMPTS - 1
+        
+        for attempt in range(MODELS_FETCH_ATTEMPTS):
+            retry_after = None
+            try:
+                async with session.get(url, headers=headers, timeout=timeout) as response:
+                    if response.status == 200:
+                        data = _json_loads(await response.read())
+                        break
+                    if response.status not in RETRYABLE_STATUSES or attempt == last_attempt:
+                        logger.warning("Failed to fetch models (Status: %s). Using fallback free models. Error: %s", response.status, await response.text())
+                        return None
+                    retry_after = response.headers.get("Retry-After")
+            except (aiohttp.ClientError, asyncio.TimeoutError):
+                if attempt == last_attempt:
+                    raise
+                    
+            delay = MODELS_FETCH_BACKOFF * 4 ** attempt + random.uniform(0, 0.1)
+            if retry_after:
+                try:
+                    delay = max(delay, min(float(retry_after), MODELS_FETCH_MAX_RETRY_AFTER))
+                except ValueError:
+                    pass
+            await asyncio.sleep(delay)
+                
+        self._save_cached_models(data)
+        return data
+
+    def start_fetch(self) -> "asyncio.Task[Mapping[str, Any]]":
+        """Start fetch_available_models in the background.
+        
+        Rankings are refused from this call until the fetch finishes, so a caller
+        cannot silently rank against an empty model list.
+        
+        Returns:
+            Task running the fetch
+        """
+        self._fetches_pending += 1
+        task = asyncio.create_task(self.fetch_available_models())
+        task.add_done_callback(self._fetch_finished)
+        return task
+        
+    def _fetch_finished(self, _task: asyncio.Task) -> None:
+        self._fetches_pending -= 1
+        
+    async def fetch_available_models(self, force_refresh: bool = False) -> Mapping[str, Any]:
+        """Fetch available models from OpenRouter API, reusing the models already held or the disk cache while they are fresh.
+        
+        Args:
+            force_refresh: Skip both caches and always query the API
         
         Returns:
             Dictionary of available models
         """
         if not self.api_key:
-            print("Warning: API key not configured. Cannot fetch models. Using fallback free models.")
+            logger.warning("API key not configured. Cannot fetch models. Using fallback free models.")
             self._use_fallback_free_models()
             return {}
             
+        if not force_refresh:
+            # Models fetched (or loaded from disk) within the TTL are still current
+            if self._models_fetched_at and time.time() - self._models_fetched_at < self.models_cache_ttl:
+                return self.available_models
+            cached = self._load_cached_models()
+            if cached is not None:
+                self._models_fetched_at, data = cached
+                return self._process_models_data(data)
+            
         url = "https://openrouter.ai/api/v1/models"
-        headers = {"Authorization": f"Bearer {self.api_key}"}
+        key = hashlib.sha1(f"{self.api_key}\0{url}".encode()).hexdigest()
         
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, headers=headers) as response:
-                    if response.status != 200:
-                        print(f"Warning: Failed to fetch models (Status: {response.status}). Using fallback free models. Error: {await response.text()}")
-                        self._use_fallback_free_models()
-                        return {}
-                        
-                    data = await response.json()
-                    
-                    # Organize models by ID
-                    self.available_models = {model.get("id"): model for model in data.get("data", [])}
-                    
-                    # Filter free models: Look for models with ':free' suffix
-                    self.free_models = {}
-                    for model_id, model_data in self.available_models.items():
-                        if model_id.endswith(':free'):
-                            self.free_models[model_id] = model_data
-                    
-                    # If no free models detected, use fallback free models from config
-                    if not self.free_models:
-                        print("Warning: No free models detected from API. Using fallback list from config.")
-                        self._use_fallback_free_models(check_available=True)
-                    else:
-                        # Ensure the models from config are included in free_models
-                        # This ensures models explicitly configured in config.yml are always available
-                        for model_id in self.fallback_free_models_list:
-                            if model_id not in self.free_models:
-                                self.free_models[model_id] = {
-                                    "id": model_id,
-                                    "context_length": 8000, 
-                                    "description": "Added from config.yml free model list"
-                                }
-                    
-                    print(f"Found {len(self.available_models)} total models")
-                    print(f"Found {len(self.free_models)} free models")
-                    
-                    return self.available_models
+            # Join a request already in flight for the same key and URL, if any
+            task = self._inflight.get(key)
+            if task is None:
+                task = asyncio.create_task(self._request_models(url))
+                self._inflight[key] = task
+                task.add_done_callback(lambda _: self._inflight.pop(key, None))
+            # Shielded so one cancelled caller does not cancel the request for the others
+            self._fetches_pending += 1
+            try:
+                data = await asyncio.shield(task)
+            finally:
+                self._fetches_pending -= 1
+            if data is None:
+                self._use_fallback_free_models()
+                return {}
+            self._models_fetched_at = time.time()
+            return self._process_models_data(data)
         except Exception as e:
-            print(f"Error fetching models: {str(e)}. Using fallback free models.")
+            logger.error("Error fetching models: %s. Using fallback free models.", e)
             self._use_fallback_free_models()
             return {}
 
     def _use_fallback_free_models(self, check_available: bool = False):
         """Populate free_models using the fallback list from config."""
-        self.free_models = {}
+        self._free_models = {}
         for model_id in self.fallback_free_models_list:
-            if check_available and model_id in self.available_models:
+            if check_available and model_id in self._available_models:
                 # If checking available models, only add if it exists in the full list
-                self.free_models[model_id] = self.available_models[model_id]
+                self._free_models[model_id] = self._available_models[model_id]
             elif not check_available:
                 # If not checking (e.g., API failed), create minimal info
-                self.free_models[model_id] = {
+                self._free_models[model_id] = {
                     "id": model_id,
                     "context_length": 8000, # Assume a default context length
                     "description": "Fallback free model (API fetch failed or no free models found)"
                 }
-        print(f"Using {len(self.free_models)} fallback free models from config.")
+        self._models_changed()
+        logger.info("Using %d fallback free models from config.", len(self._free_models))
+        
+    @property
+    def available_models(self) -> Mapping[str, Any]:
+        """Read-only view of all models, keyed by model ID."""
+        return MappingProxyType(self._available_models)
+    
+    @property
+    def free_models(self) -> Mapping[str, Any]:
+        """Read-only view of the free models, keyed by model ID."""
+        return MappingProxyType(self._free_models)
+    
+    def _models_changed(self) -> None:
+        """Record that the model dicts changed, invalidating cached rankings."""
+        self._best_model_cache.clear()
+        self._free_ids = list(self._free_models)
+        self._free_bases = [model_id.partition(':')[0] for model_id in self._free_ids]
+        self._free_ctx = [model.get("context_length", 0) for model in self._free_models.values()]
+        self._available_ids = list(self._available_models)
+        self._available_bases = [model_id.partition(':')[0] for model_id in self._available_ids]
+        self._available_ctx = [model.get("context_length", 0) for model in self._available_models.values()]
 
     def get_api_key_for_model(self, model_id: str) -> Optional[str]:
         """Get the specific API key for a model, falling back to default or env var."""
@@ -127,18 +394,38 @@ class ModelRegistry:
     def get_best_model_for_task(self, task: str, free_only: bool = True) -> Tuple[str, str]:
         """Get the best model for a specific task based on config capabilities.
         
+        Results are cached until the model list changes.
+        
         Args:
             task: Task name (e.g., 'code_generation')
             free_only: Whether to only consider free models
             
         Returns:
             Tuple of (primary_model, backup_model)
+            
+        Raises:
+            RuntimeError: If a model fetch is still in progress; await it (or
+                DynamicConfigManager.ensure_models_loaded()) first
         """
-        models_to_consider = self.free_models if free_only else self.available_models
+        if self._fetches_pending:
+            raise RuntimeError(
+                "Model list is still being fetched; await ensure_models_loaded() "
+                "or use aget_best_model_for_task() instead"
+            )
+        key = (task, free_only)
+        result = self._best_model_cache.get(key)
+        if result is None:
+            result = self._compute_best_model_for_task(task, free_only)
+            self._best_model_cache[key] = result
+        return result
+        
+    def _compute_best_model_for_task(self, task: str, free_only: bool) -> Tuple[str, str]:
+        """Rank the available models for a task (uncached get_best_model_for_task)."""
+        models_to_consider = self._free_models if free_only else self._available_models
         
         # Use default models from config if no models fetched/available
         if not models_to_consider:
-            print(f"Warning: No {'free ' if free_only else ''}models available for task '{task}'. Using default models from config.")
+            logger.warning("No %smodels available for task '%s'. Using default models from config.", 'free ' if free_only else '', task)
             defaults = self.default_models_by_task.get(task, self.default_models_by_task.get("default"))
             return defaults[0], defaults[1] if len(defaults) > 1 else defaults[0]
         
@@ -147,41 +434,40 @@ class ModelRegistry:
         
         # Handle empty case - use default models from config
         if not task_capabilities:
-            print(f"No capabilities defined for task '{task}'. Using default models from config.")
+            logger.info("No capabilities defined for task '%s'. Using default models from config.", task)
             defaults = self.default_models_by_task.get(task, self.default_models_by_task.get("default"))
             return defaults[0], defaults[1] if len(defaults) > 1 else defaults[0]
         
+        capability_rank = self._capability_rank.get(task, {})
+        
+        if free_only:
+            model_ids, model_bases, context_lengths = self._free_ids, self._free_bases, self._free_ctx
+        else:
+            model_ids, model_bases, context_lengths = self._available_ids, self._available_bases, self._available_ctx
+        
         ranked_models = []
-        for model_id in models_to_consider.keys():
-            # Calculate score based on matching capability prefixes
-            score = 0
-            model_base = model_id.split(':')[0]  # Remove :free suffix if present
-            
-            for capability in task_capabilities:
-                # Use exact model ID comparison to avoid partial prefix matching
-                if capability == model_base or model_id == capability:
-                    # Score based on position in capability list (first is best)
-                    score = len(task_capabilities) - task_capabilities.index(capability)
-                    break
+        for model_id, model_base, context_length in zip(model_ids, model_bases, context_lengths):
+            # Score based on position in capability list (first is best); exact
+            # model ID comparison avoids partial prefix matching
+            score = max(capability_rank.get(model_base, 0), capability_rank.get(model_id, 0))
             
             # Also consider context length as a factor
-            context_length = models_to_consider[model_id].get("context_length", 0)
             # Normalize context length score (e.g., 1 point per 16k context, capped)
             size_score = min(context_length / 16000, 5) 
             
             total_score = score + size_score
             ranked_models.append((model_id, total_score))
         
-        # Sort by score (descending)
-        ranked_models.sort(key=lambda x: x[1], reverse=True)
+        # Only the top two are needed (ties keep their original order, as with a stable sort)
+        top_models = heapq.nlargest(2, ranked_models, key=operator.itemgetter(1))
         
-        if len(ranked_models) >= 2:
-            return ranked_models[0][0], ranked_models[1][0]
-        elif len(ranked_models) == 1:
-            return ranked_models[0][0], ranked_models[0][0]
+        if len(top_models) >= 2:
+            return top_models[0][0], top_models[1][0]
+        elif len(top_models) == 1:
+            return top_models[0][0], top_models[0][0]
         else:
             # Fallback to defaults from config if no suitable model found after ranking
-            print(f"Warning: No suitable {'free ' if free_only else ''}model found for task '{task}' after ranking. Using default models from config.")
+            logger.warning("No suitable %smodel found for task '%s' after ranking. Using default models from config.", 'free ' if free_only else '', task)
             defaults = self.default_models_by_task.get(task, self.default_models_by_task.get("default"))
             return defaults[0], defaults[1] if len(defaults) > 1 else defaults[0]
 
@@ -194,11 +480,20 @@ class RoleManager:
         Args:
             config: Loaded configuration dictionary (e.g., from config.yml)
         """
-        self.roles = config.get("ROLES", {}) if config else CONFIG.get("ROLES", {})
+        cfg = config or CONFIG
+        self.roles = cfg.get("ROLES", {})
         if not self.roles:
-            print("Warning: No roles found in configuration.")
+            logger.warning("No roles found in configuration.")
         self.loaded = bool(self.roles)
         
+        # Flat per-field lookups for the hot getters below
+        roles = {name: role for name, role in self.roles.items() if isinstance(role, dict)}
+        self._system_prompts = {name: role.get("system_prompt") for name, role in roles.items()}
+        self._output_formats = {name: role.get("output_format") for name, role in roles.items()}
+        self._model_prefs = {name: role.get("model_preferences") for name, role in roles.items()}
+        # Every role comes from the config, so all of them are built-in
+        self._builtin_role_names = tuple(sorted(roles))
+        
     def load_roles(self) -> Dict[str, Any]:
         """Returns the loaded role definitions.
         
@@ -208,6 +503,14 @@ class RoleManager:
         # Roles are now loaded during __init__ from the main config
         return self.roles
 
+    def list_roles(self) -> Dict[str, List[str]]:
+        """List the available role names.
+        
+        Returns:
+            Dictionary with sorted 'builtin' and 'custom' role name lists
+        """
+        return {"builtin": list(self._builtin_role_names), "custom": []}
+
     def get_role(self, role_name: str) -> Optional[Dict[str, Any]]:
         """Get definition for a specific role.
         
@@ -228,8 +531,7 @@ class RoleManager:
         Returns:
             System prompt string or None if not found
         """
-        role = self.get_role(role_name)
-        return role.get("system_prompt") if role else None
+        return self._system_prompts.get(role_name)
 
     def get_output_format(self, role_name: str) -> Optional[Dict[str, Any]]:
         """Get the output format specification for a specific role.
@@ -240,8 +542,7 @@ class RoleManager:
         Returns:
             Output format dictionary or None if not found
         """
-        role = self.get_role(role_name)
-        return role.get("output_format") if role else None
+        return self._output_formats.get(role_name)
 
     def get_model_preferences(self, role_name: str) -> Optional[Dict[str, Any]]:
         """Get the model preferences for a specific role.
@@ -252,8 +553,30 @@ class RoleManager:
         Returns:
             Model preferences dictionary or None if not found
         """
-        role = self.get_role(role_name)
-        return role.get("model_preferences") if role else None
+        return self._model_prefs.get(role_name)
+
+def _resolve_config_path(config_path: Path) -> Optional[Path]:
+    """Find a configuration file in the usual locations, checking each candidate once.
+    
+    Args:
+        config_path: Configured path, absolute or relative
+        
+    Returns:
+        Absolute path of the first existing candidate, or None if none exists
+    """
+    script_dir = Path(__file__).parent
+    candidates = [config_path]
+    if not config_path.is_absolute():
+        candidates.append(script_dir / config_path)
+    candidates += [
+        Path.cwd() / config_path.name,
+        script_dir / config_path.name,
+        script_dir / "config" / config_path.name
+    ]
+    for path in dict.fromkeys(candidates):
+        if path.exists():
+            return Path(os.path.abspath(path))
+    return None
 
 class DynamicConfigManager:
     """Dynamic configuration manager for loading and managing configuration."""
@@ -264,66 +587,107 @@ class DynamicConfigManager:
         Args:
             config_path: Path to configuration file
         """
-        # Convert string path to Path object
-        if isinstance(config_path, str):
-            # Handle both absolute and relative paths
-            if os.path.isabs(config_path):
-                self.config_path = Path(config_path)
-            else:
-                # Try relative to current directory
-                if os.path.exists(config_path):
-                    self.config_path = Path(os.path.abspath(config_path))
-                else:
-                    # Try relative to script directory
-                    script_dir = Path(__file__).parent
-                    alt_path = script_dir / config_path
-                    if alt_path.exists():
-                        self.config_path = alt_path
-                    else:
-                        # Just store the path and we'll check existence in initialize()
-                        self.config_path = Path(config_path)
-        else:
-            self.config_path = config_path
+        # Resolved against the usual config locations in initialize()
+        self.config_path = Path(config_path)
             
         self.config = {}
         self.model_registry = None
         self.role_manager = None
         self.loaded = False
+        self._fetch_task: Optional[asyncio.Task] = None
         
-    async def initialize(self) -> None:
-        """Load configuration and initialize managers."""
-        if not self.config_path.exists():
-            # Try to find the config file in common locations
-            potential_paths = [
-                self.config_path,
-                Path(os.getcwd()) / self.config_path.name,
-                Path(__file__).parent / self.config_path.name,
-                Path(__file__).parent / "config" / self.config_path.name
-            ]
-            
-            for path in potential_paths:
-                if path.exists():
-                    self.config_path = path
-                    break
-            else:
-                raise FileNotFoundError(f"Configuration file not found: {self.config_path}")
+        # Parsed workflow files: path -> (mtime_ns, parsed YAML)
+        self._workflow_cache: Dict[str, Tuple[int, Any]] = {}
+        
+    async def initialize(self, fetch_models: bool = True) -> None:
+        """Load configuration and initialize managers.
+        
+        The model list is fetched in the background; await ensure_models_loaded()
+        before relying on it.
+        
+        Args:
+            fetch_models: Whether to start fetching the model list from OpenRouter
+                (callers that populate the registry themselves can skip it)
+        """
+        config_path = _resolve_config_path(self.config_path)
+        if config_path is None:
+            raise FileNotFoundError(f"Configuration file not found: {self.config_path}")
+        self.config_path = config_path
         
         try:
-            with open(self.config_path, 'r') as f:
-                self.config = yaml.safe_load(f)
+            # Parse in a worker thread so the event loop keeps running (e.g. the model fetch)
+            self.config = await asyncio.to_thread(_load_yaml_file, self.config_path)
         except Exception as e:
             raise IOError(f"Error loading configuration file {self.config_path}: {str(e)}")
             
         # Initialize Model Registry with config
         self.model_registry = ModelRegistry(config=self.config)
-        await self.model_registry.fetch_available_models() # Fetch models upon initialization
+        if fetch_models:
+            # Fetch models in the background so initialization does not wait on the network
+            self._fetch_task = self.model_registry.start_fetch()
         
         # Initialize Role Manager with config
         self.role_manager = RoleManager(config=self.config)
         self.role_manager.load_roles() # Load roles from config
         
         self.loaded = True
-        print("Dynamic configuration loaded successfully.")
+        logger.info("Dynamic configuration loaded successfully.")
+
+    async def ensure_models_loaded(self) -> None:
+        """Wait for the background model fetch started by initialize(), if any."""
+        if self._fetch_task is not None:
+            await self._fetch_task
+            
+    async def aget_best_model_for_task(self, task: str, free_only: bool = True) -> Tuple[str, str]:
+        """Get the best models for a task once the model list has been loaded.
+        
+        Args:
+            task: Task name (e.g., 'code_generation')
+            free_only: Whether to only consider free models
+            
+        Returns:
+            Tuple of (primary_model, backup_model)
+        """
+        await self.ensure_models_loaded()
+        return self.get_model_registry().get_best_model_for_task(task, free_only)
+
+    async def generate_config_from_available_models(self) -> Dict[str, Any]:
+        """Pick primary and backup models for every known task from the fetched model list.
+
+        Only the regenerated sections are returned, so callers can merge them into
+        the loaded config without rewriting the rest of it. Settings already present
+        for a task (system prompt, max tokens) are kept; the model and its context
+        window are replaced.
+
+        Returns:
+            Dictionary holding the regenerated 'TASK_MODEL_MAPPING' section
+        """
+        registry = self.get_model_registry()
+        await self.ensure_models_loaded()
+
+        current_mapping = self.config.get("TASK_MODEL_MAPPING") or {}
+        tasks = dict.fromkeys(itertools.chain(
+            current_mapping, registry.model_capabilities, registry.default_models_by_task))
+        tasks.pop("default", None)
+
+        task_model_mapping = {}
+        for task in tasks:
+            current_task = current_mapping.get(task) or {}
+            task_config = task_model_mapping[task] = {}
+            for slot, model_id in zip(("primary", "backup"), registry.get_best_model_for_task(task)):
+                slot_config = task_config[slot] = dict(current_task.get(slot) or {})
+                slot_config["model"] = model_id
+                context_length = registry.available_models.get(model_id, {}).get("context_length")
+                if context_length:
+                    slot_config["context_window"] = context_length
+        return {"TASK_MODEL_MAPPING": task_model_mapping}
+
+    async def aclose(self) -> None:
+        """Release network resources held by the managers."""
+        if self._fetch_task is not None and not self._fetch_task.done():
+            self._fetch_task.cancel()
+        if self.model_registry:
+            await self.model_registry.aclose()
 
     def get_config_section(self, section_name: str) -> Optional[Dict[str, Any]]:
         """Get a specific section from the loaded configuration.
@@ -350,6 +714,24 @@ class DynamicConfigManager:
             raise RuntimeError("RoleManager not initialized. Call initialize() first.")
         return self.role_manager
 
+    def _load_workflow_file(self, workflow_file: Path, mtime_ns: int) -> Any:
+        """Parse a workflow file, reusing the previous parse while its mtime is unchanged.
+        
+        Args:
+            workflow_file: Path to the workflow YAML file
+            mtime_ns: Current modification time of the file
+            
+        Returns:
+            Parsed YAML content
+        """
+        key = str(workflow_file)
+        cached = self._workflow_cache.get(key)
+        if cached is not None and cached[0] == mtime_ns:
+            return cached[1]
+        workflow_config = _load_yaml_file(workflow_file)
+        self._workflow_cache[key] = (mtime_ns, workflow_config)
+        return workflow_config
+
     def get_workflow_stages(self, workflow_name: str) -> Optional[List[Dict[str, Any]]]:
         """Get the stages for a specific workflow by loading its YAML file.
         
@@ -370,10 +752,10 @@ class DynamicConfigManager:
             Path.home() / "workflows"               # User's home directory
         ]
         
-        # Print all workflow directories being searched (for debugging)
-        print(f"Searching for workflow '{workflow_name}' in:")
+        # Log all workflow directories being searched (for debugging)
+        logger.debug("Searching for workflow '%s' in:", workflow_name)
         for wf_dir in possible_workflow_dirs:
-            print(f"  - {wf_dir}")
+            logger.debug("  - %s", wf_dir)
         
         # Try multiple file extensions
         extensions = ['.yml', '.yaml', '']
@@ -383,30 +765,32 @@ class DynamicConfigManager:
             for ext in extensions:
                 workflow_file = workflow_dir / f"{workflow_name}{ext}"
                 try:
-                    if workflow_file.exists():
-                        print(f"Found workflow file: {workflow_file}")
-                        with open(workflow_file, 'r') as f:
-                            workflow_config = yaml.safe_load(f)
-                            # Assuming the stages are the top-level list in the YAML
-                            if isinstance(workflow_config, list):
-                                return workflow_config
-                            # Or if they are under a specific key like 'stages'
-                            elif isinstance(workflow_config, dict) and 'stages' in workflow_config:
-                                return workflow_config.get('stages')
-                            else:
-                                print(f"Warning: Unexpected format in workflow file: {workflow_file}")
+                    try:
+                        mtime_ns = workflow_file.stat().st_mtime_ns
+                    except FileNotFoundError:
+                        continue
+                    logger.info("Found workflow file: %s", workflow_file)
+                    workflow_config = self._load_workflow_file(workflow_file, mtime_ns)
+                    # Assuming the stages are the top-level list in the YAML
+                    if isinstance(workflow_config, list):
+                        return workflow_config
+                    # Or if they are under a specific key like 'stages'
+                    elif isinstance(workflow_config, dict) and 'stages' in workflow_config:
+                        return workflow_config.get('stages')
+                    else:
+                        logger.warning("Unexpected format in workflow file: %s", workflow_file)
                 except Exception as e:
-                    print(f"Error attempting to load workflow file {workflow_file}: {str(e)}")
+                    logger.error("Error attempting to load workflow file %s: %s", workflow_file, e)
         
         # Final fallback - look directly in the config file
-        print(f"Workflow file not found in any location. Checking main config for inline workflow definition.")
+        logger.info("Workflow file not found in any location. Checking main config for inline workflow definition.")
         workflows_section = self.config.get("WORKFLOWS")
         if workflows_section and workflow_name in workflows_section:
-            print(f"Loading workflow '{workflow_name}' from main config.")
+            logger.info("Loading workflow '%s' from main config.", workflow_name)
             return workflows_section.get(workflow_name)
                     
         # If we got here, we couldn't find the workflow
-        print(f"ERROR: Could not find workflow '{workflow_name}' in any location.")
+        logger.error("Could not find workflow '%s' in any location.", workflow_name)
         return None
 
 # Example usage (optional, for testing)
@@ -414,6 +798,7 @@ async def main():
     config_manager = DynamicConfigManager()
     try:
         await config_manager.initialize()
+        await config_manager.ensure_models_loaded()
         
         # Access config sections
         openrouter_config = config_manager.get_config_section("OPENROUTER_CONFIG")
@@ -439,4 +824,5 @@ async def main():
 
 if __name__ == "__main__":
     import asyncio
+    logging.basicConfig(level=logging.INFO)
     asyncio.run(main())
\ No newline at end of file
@@ -44,6 +44,8 @@ class CollaborativeTaskOrchestrator:
     async def initialize(self) -> None:
         """Initialize the orchestrator with all components."""
         await self.config_manager.initialize()
+        # Model selection below is synchronous, so wait for the model list now
+        await self.config_manager.ensure_models_loaded()
         
         # Now that config is loaded, initialize components
         # Get the full config to pass to the adapter instead of just the OPENROUTER_CONFIG section
@@ -67,6 +69,10 @@ class CollaborativeTaskOrchestrator:
             self.memory
         )
     
+    async def aclose(self) -> None:
+        """Release the config manager's network resources."""
+        await self.config_manager.aclose()
+        
     async def execute_workflow(self, workflow_name: str, input_data: str) -> Dict[str, Any]:
         """Execute a complete workflow using collaborative conversations between models.
         
@@ -351,15 +357,18 @@ async def main():
     orchestrator = CollaborativeTaskOrchestrator(config_path)
     await orchestrator.initialize()
     
-    # Example input
-    initial_requirements = "Create a simple web application for managing tasks."
-    
-    # Execute the collaborative workflow defined in the workflow file
-    # The workflow name 'collaborative' should match the key in config.yml or the filename
-    results = await orchestrator.execute_workflow("collaborative", initial_requirements)
-    
-    print("\n=== Final Workflow Results ===")
-    print(json.dumps(results, indent=2))
+    try:
+        # Example input
+        initial_requirements = "Create a simple web application for managing tasks."
+        
+        # Execute the collaborative workflow defined in the workflow file
+        # The workflow name 'collaborative' should match the key in config.yml or the filename
+        results = await orchestrator.execute_workflow("collaborative", initial_requirements)
+        
+        print("\n=== Final Workflow Results ===")
+        print(json.dumps(results, indent=2))
+    finally:
+        await orchestrator.aclose()
 
 if __name__ == "__main__":
     asyncio.run(main())
\ No newline at end of file
@@ -4,17 +4,24 @@
 import os
 import yaml
 import json
+import heapq
+import operator
 import aiohttp
 from typing import Dict, List, Any, Optional, Tuple
 from pathlib import Path
 
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:  # libyaml not available
+    from yaml import SafeLoader
+
 # Load the main configuration file once from the parent directory
 CONFIG_PATH = Path(__file__).parent.parent / "config.yml"
 CONFIG = {}
 if CONFIG_PATH.exists():
     try:
         with open(CONFIG_PATH, 'r') as f:
-            CONFIG = yaml.safe_load(f)
+            CONFIG = yaml.load(f, Loader=SafeLoader)
     except Exception as e:
         print(f"Warning: Could not load config.yml from {CONFIG_PATH}: {e}")
 
@@ -38,12 +45,24 @@ class ModelRegistry:
 
         self.available_models = {}
         self.free_models = {}
+        
+        # Ranking results cached per (task, free_only); cleared whenever the
+        # model dicts are replaced
+        self._best_model_cache: Dict[Tuple[str, bool], Tuple[str, str]] = {}
 
         # Load model registry settings from config
         model_registry_config = effective_config.get("MODEL_REGISTRY", {})
         self.model_capabilities = model_registry_config.get("model_capabilities", {})
         self.fallback_free_models_list = model_registry_config.get("fallback_free_models", [])
         self.default_models_by_task = model_registry_config.get("default_models_by_task", {})
+        # Capability prefix -> (task, rank score) pairs, first listed capability
+        # scoring highest; a model's scores for every task come from one walk
+        # over the prefixes of its ID, memoized per model base
+        self._prefix_ranks: Dict[str, List[Tuple[str, int]]] = {}
+        for task_name, capabilities in self.model_capabilities.items():
+            for i, capability in enumerate(capabilities):
+                self._prefix_ranks.setdefault(capability, []).append((task_name, len(capabilities) - i))
+        self._model_task_scores: Dict[str, Dict[str, int]] = {}
         # Ensure a basic default exists if config is missing the 'default' key
         if "default" not in self.default_models_by_task:
             self.default_models_by_task["default"] = ["google/gemini-flash-1.5:free", "google/gemini-flash-1.5:free"] # A sensible, widely available free default
@@ -74,20 +93,23 @@ class ModelRegistry:
                         
                     data = await response.json()
                     
-                    # Organize models by ID
-                    self.available_models = {model.get("id"): model for model in data.get("data", [])}
-                    
-                    # Filter free models: Look for models with ':free' suffix
+                    # Organize models by ID and pick out free models (':free' suffix) in one pass
+                    self.available_models = {}
                     self.free_models = {}
-                    for model_id, model_data in self.available_models.items():
+                    for model in data.get("data", ()):
+                        model_id = model.get("id")
+                        if not model_id:
+                            continue
+                        self.available_models[model_id] = model
                         if model_id.endswith(':free'):
-                            self.free_models[model_id] = model_data
+                            self.free_models[model_id] = model
                     
                     # If no free models detected, use fallback free models from config
                     if not self.free_models:
                         print("Warning: No free models detected from API. Using fallback list from config.")
                         self._use_fallback_free_models(check_available=True)
                     
+                    self._models_changed()
                     print(f"Found {len(self.available_models)} total models")
                     print(f"Found {len(self.free_models)} free models")
                     
@@ -111,15 +133,42 @@ class ModelRegistry:
                     "context_length": 8000, # Assume a default context length
                     "description": "Fallback free model (API fetch failed or no free models found)"
                 }
+        self._models_changed()
         print(f"Using {len(self.free_models)} fallback free models from config.")
+        
+    def _models_changed(self) -> None:
+        """Record that the model dicts changed, invalidating cached rankings."""
+        self._best_model_cache.clear()
 
     def get_api_key_for_model(self, model_id: str) -> Optional[str]:
         """Get the specific API key for a model, falling back to default or env var."""
         return self.model_keys.get(model_id, self.api_key)
     
+    def _get_task_scores(self, model_base: str) -> Dict[str, int]:
+        """Get a model's capability score for every task that has a matching prefix.
+        
+        Args:
+            model_base: Model ID without its ':free' style suffix
+            
+        Returns:
+            Dictionary of task name to capability rank score
+        """
+        scores = self._model_task_scores.get(model_base)
+        if scores is None:
+            scores = {}
+            prefix_ranks = self._prefix_ranks
+            for end in range(len(model_base) + 1):
+                for task_name, rank in prefix_ranks.get(model_base[:end], ()):
+                    if rank > scores.get(task_name, 0):
+                        scores[task_name] = rank
+            self._model_task_scores[model_base] = scores
+        return scores
+        
     def get_best_model_for_task(self, task: str, free_only: bool = True) -> Tuple[str, str]:
         """Get the best model for a specific task based on config capabilities.
         
+        Results are cached until the model list changes.
+        
         Args:
             task: Task name (e.g., 'code_generation')
             free_only: Whether to only consider free models
@@ -127,6 +176,15 @@ class ModelRegistry:
         Returns:
             Tuple of (primary_model, backup_model)
         """
+        key = (task, free_only)
+        result = self._best_model_cache.get(key)
+        if result is None:
+            result = self._compute_best_model_for_task(task, free_only)
+            self._best_model_cache[key] = result
+        return result
+        
+    def _compute_best_model_for_task(self, task: str, free_only: bool) -> Tuple[str, str]:
+        """Rank the available models for a task (uncached get_best_model_for_task)."""
         models_to_consider = self.free_models if free_only else self.available_models
         
         # Use default models from config if no models fetched/available
@@ -136,35 +194,27 @@ class ModelRegistry:
             return defaults[0], defaults[1] if len(defaults) > 1 else defaults[0]
         
         # Match models to capabilities defined in config
-        task_capabilities = self.model_capabilities.get(task, [])
-        
         ranked_models = []
-        for model_id in models_to_consider.keys():
-            # Calculate score based on matching capability prefixes
-            score = 0
+        for model_id, model_data in models_to_consider.items():
+            # Score based on the best matching capability prefix (first listed is best)
             model_base = model_id.split(':')[0]  # Remove :free suffix if present
-            
-            for capability in task_capabilities:
-                if model_base.startswith(capability):
-                    # Score based on position in capability list (first is best)
-                    score = len(task_capabilities) - task_capabilities.index(capability)
-                    break
+            score = self._get_task_scores(model_base).get(task, 0)
             
             # Also consider context length as a factor
-            context_length = models_to_consider[model_id].get("context_length", 0)
+            context_length = model_data.get("context_length", 0)
             # Normalize context length score (e.g., 1 point per 16k context, capped)
             size_score = min(context_length / 16000, 5) 
             
             total_score = score + size_score
             ranked_models.append((model_id, total_score))
         
-        # Sort by score (descending)
-        ranked_models.sort(key=lambda x: x[1], reverse=True)
+        # Only the top two are needed (ties keep their original order, as with a stable sort)
+        top_models = heapq.nlargest(2, ranked_models, key=operator.itemgetter(1))
         
-        if len(ranked_models) >= 2:
-            return ranked_models[0][0], ranked_models[1][0]
-        elif len(ranked_models) == 1:
-            return ranked_models[0][0], ranked_models[0][0]
+        if len(top_models) >= 2:
+            return top_models[0][0], top_models[1][0]
+        elif len(top_models) == 1:
+            return top_models[0][0], top_models[0][0]
         else:
             # Fallback to defaults from config if no suitable model found after ranking
             print(f"Warning: No suitable {'free ' if free_only else ''}model found for task '{task}' after ranking. Using default models from config.")
@@ -270,7 +320,7 @@ class DynamicConfigManager:
              
         try:
             with open(self.config_path, 'r') as f:
-                self.config = yaml.safe_load(f)
+                self.config = yaml.load(f, Loader=SafeLoader)
         except Exception as e:
             raise IOError(f"Error loading configuration file {self.config_path}: {str(e)}")
          
@@ -332,7 +382,7 @@ class DynamicConfigManager:
         if workflow_file.exists():
             try:
                 with open(workflow_file, 'r') as f:
-                    workflow_data = yaml.safe_load(f)
+                    workflow_data = yaml.load(f, Loader=SafeLoader)
                 return workflow_data.get('tasks') # Assuming 'tasks' key in separate files
             except Exception as e:
                 print(f"Warning: Could not load workflow file {workflow_file}: {e}")
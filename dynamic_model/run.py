@@ -23,44 +23,47 @@ async def list_models(config_path: str):
     config_manager = DynamicConfigManager(config_path)
     await config_manager.initialize()
     
-    # Print API key info
-    api_key = config_manager.config.get("OPENROUTER_API_KEY", "")
-    if api_key:
-        print(f"Using API key (first 5 chars): {api_key[:5]}...")
-    else:
-        print("No API key found in configuration.")
-        return []
-    
-    print("Fetching available models from OpenRouter...")
-    
     try:
-        # Fetch models
-        await config_manager.model_registry.fetch_available_models()
-        
-        # Get all models
-        all_models = config_manager.model_registry.available_models
-        
-        # Get free models
-        free_models = config_manager.model_registry.free_models
+        # Print API key info
+        api_key = config_manager.config.get("OPENROUTER_API_KEY", "")
+        if api_key:
+            print(f"Using API key (first 5 chars): {api_key[:5]}...")
+        else:
+            print("No API key found in configuration.")
+            return []
         
-        # Display API key info
-        print(f"\n{'=' * 60}")
-        print(f"Found {len(all_models)} total models")
-        print(f"Found {len(free_models)} free models")
-        print(f"{'=' * 60}")
+        print("Fetching available models from OpenRouter...")
         
-        # Display free models
-        for i, (model_id, model_data) in enumerate(free_models.items(), 1):
-            context_length = model_data.get("context_length", "Unknown")
-            print(f"{i}. {model_id}")
-            print(f"   Context length: {context_length}")
-            print(f"   Description: {model_data.get('description', 'No description')}")
+        try:
+            # Fetch models
+            await config_manager.model_registry.fetch_available_models()
+            
+            # Get all models
+            all_models = config_manager.model_registry.available_models
+            
+            # Get free models
+            free_models = config_manager.model_registry.free_models
+            
+            # Display API key info
+            print(f"\n{'=' * 60}")
+            print(f"Found {len(all_models)} total models")
+            print(f"Found {len(free_models)} free models")
             print(f"{'=' * 60}")
-        
-        return list(free_models.keys())
-    except Exception as e:
-        print(f"Error fetching models: {str(e)}")
-        return []
+            
+            # Display free models
+            for i, (model_id, model_data) in enumerate(free_models.items(), 1):
+                context_length = model_data.get("context_length", "Unknown")
+                print(f"{i}. {model_id}")
+                print(f"   Context length: {context_length}")
+                print(f"   Description: {model_data.get('description', 'No description')}")
+                print(f"{'=' * 60}")
+            
+            return list(free_models.keys())
+        except Exception as e:
+            print(f"Error fetching models: {str(e)}")
+            return []
+    finally:
+        await config_manager.aclose()
 
 async def list_roles(config_path: str):
     """List available roles.
@@ -72,25 +75,28 @@ async def list_roles(config_path: str):
     config_manager = DynamicConfigManager(config_path)
     await config_manager.initialize()
     
-    # List roles
-    roles = config_manager.role_manager.list_roles()
-    
-    print("\nBuilt-in Roles:")
-    for role in roles["builtin"]:
-        role_data = config_manager.role_manager.get_role(role)
-        print(f"- {role}: {role_data.get('name', role)}")
-        print(f"  {role_data.get('description', '')}")
-    
-    if roles["custom"]:
-        print("\nCustom Roles:")
-        for role in roles["custom"]:
+    try:
+        # List roles
+        roles = config_manager.role_manager.list_roles()
+        
+        print("\nBuilt-in Roles:")
+        for role in roles["builtin"]:
             role_data = config_manager.role_manager.get_role(role)
             print(f"- {role}: {role_data.get('name', role)}")
             print(f"  {role_data.get('description', '')}")
-    else:
-        print("\nNo custom roles defined.")
         
-    return roles
+        if roles["custom"]:
+            print("\nCustom Roles:")
+            for role in roles["custom"]:
+                role_data = config_manager.role_manager.get_role(role)
+                print(f"- {role}: {role_data.get('name', role)}")
+                print(f"  {role_data.get('description', '')}")
+        else:
+            print("\nNo custom roles defined.")
+            
+        return roles
+    finally:
+        await config_manager.aclose()
 
 async def list_workflows(config_path: str):
     """List available workflows.
@@ -102,16 +108,19 @@ async def list_workflows(config_path: str):
     config_manager = DynamicConfigManager(config_path)
     await config_manager.initialize()
     
-    # List workflows
-    workflows = config_manager.workflow_manager.list_workflows()
-    
-    print("\nAvailable Workflows:")
-    for workflow in workflows:
-        print(f"- {workflow['name']}: {workflow['display_name']}")
-        print(f"  {workflow['description']}")
-        print(f"  Stages: {workflow['stages']}")
+    try:
+        # List workflows
+        workflows = config_manager.workflow_manager.list_workflows()
         
-    return workflows
+        print("\nAvailable Workflows:")
+        for workflow in workflows:
+            print(f"- {workflow['name']}: {workflow['display_name']}")
+            print(f"  {workflow['description']}")
+            print(f"  Stages: {workflow['stages']}")
+            
+        return workflows
+    finally:
+        await config_manager.aclose()
 
 async def update_config(config_path: str):
     """Update configuration with available free models.
@@ -123,31 +132,35 @@ async def update_config(config_path: str):
     config_manager = DynamicConfigManager(config_path)
     await config_manager.initialize()
     
-    print("Updating configuration with available models...")
-    
     try:
-        # Generate updated config
-        new_config = await config_manager.generate_config_from_available_models()
+        print("Updating configuration with available models...")
         
-        # Save new config
-        with open(config_path, 'w') as f:
-            yaml.dump(new_config, f, default_flow_style=False)
+        try:
+            # Generate updated config
+            new_sections = await config_manager.generate_config_from_available_models()
             
-        print(f"Configuration updated and saved to {config_path}")
-        
-        # Show updated model assignments
-        print("\nUpdated Task-Model Assignments:")
-        for task, task_config in new_config.get("TASK_MODEL_MAPPING", {}).items():
-            primary_model = task_config.get("primary", {}).get("model", "N/A")
-            backup_model = task_config.get("backup", {}).get("model", "N/A")
-            print(f"- {task}:")
-            print(f"  Primary: {primary_model}")
-            print(f"  Backup: {backup_model}")
+            # Save new config; the generator only returns the sections it rebuilt
+            new_config = {**config_manager.config, **new_sections}
+            with open(config_path, 'w') as f:
+                yaml.dump(new_config, f, default_flow_style=False)
+                
+            print(f"Configuration updated and saved to {config_path}")
             
-        return new_config
-    except Exception as e:
-        print(f"Error updating configuration: {str(e)}")
-        return None
+            # Show updated model assignments
+            print("\nUpdated Task-Model Assignments:")
+            for task, task_config in new_config.get("TASK_MODEL_MAPPING", {}).items():
+                primary_model = task_config.get("primary", {}).get("model", "N/A")
+                backup_model = task_config.get("backup", {}).get("model", "N/A")
+                print(f"- {task}:")
+                print(f"  Primary: {primary_model}")
+                print(f"  Backup: {backup_model}")
+                
+            return new_config
+        except Exception as e:
+            print(f"Error updating configuration: {str(e)}")
+            return None
+    finally:
+        await config_manager.aclose()
 
 async def run_project(config_path: str, idea: str, workflow: str = "standard", parallel: bool = False, 
                      workspace_dir: str = "./workspace", disable_validation: bool = False):
@@ -170,35 +183,38 @@ async def run_project(config_path: str, idea: str, workflow: str = "standard", p
     orchestrator = DynamicTaskOrchestrator(config_path)
     await orchestrator.initialize()
     
-    # Set validation flag in orchestrator
-    if disable_validation and hasattr(orchestrator, 'validator'):
-        # Temporarily disable validation
-        orchestrator.validation_enabled = not disable_validation
-    
-    # Run workflow
-    if parallel:
-        print("Running in parallel mode...")
-        results = await orchestrator.run_parallel_workflow(
-            input_idea=idea,
-            workflow_name=workflow,
-            workspace_dir=workspace_dir
-        )
-    else:
-        print("Running in sequential mode...")
-        results = await orchestrator.run_workflow(
-            input_idea=idea,
-            workflow_name=workflow,
-            workspace_dir=workspace_dir
-        )
-    
-    print(f"\nProject completed! Results saved to {workspace_dir}")
-    print("Files generated:")
-    for key in results.keys():
-        if key != "user_idea":
-            print(f"- {key}.txt")
-    print(f"- project_summary.md")
-    
-    return results
+    try:
+        # Set validation flag in orchestrator
+        if disable_validation and hasattr(orchestrator, 'validator'):
+            # Temporarily disable validation
+            orchestrator.validation_enabled = not disable_validation
+        
+        # Run workflow
+        if parallel:
+            print("Running in parallel mode...")
+            results = await orchestrator.run_parallel_workflow(
+                input_idea=idea,
+                workflow_name=workflow,
+                workspace_dir=workspace_dir
+            )
+        else:
+            print("Running in sequential mode...")
+            results = await orchestrator.run_workflow(
+                input_idea=idea,
+                workflow_name=workflow,
+                workspace_dir=workspace_dir
+            )
+        
+        print(f"\nProject completed! Results saved to {workspace_dir}")
+        print("Files generated:")
+        for key in results.keys():
+            if key != "user_idea":
+                print(f"- {key}.txt")
+        print(f"- project_summary.md")
+        
+        return results
+    finally:
+        await orchestrator.aclose()
 
 async def check_workflow_exists(config_path: str, workflow_name: str):
     """Check if a workflow exists in the configuration.
@@ -214,9 +230,12 @@ async def check_workflow_exists(config_path: str, workflow_name: str):
     config_manager = DynamicConfigManager(config_path)
     await config_manager.initialize()
     
-    # Check if workflow exists
-    workflow = config_manager.workflow_manager.get_workflow(workflow_name)
-    return workflow is not None
+    try:
+        # Check if workflow exists
+        workflow = config_manager.workflow_manager.get_workflow(workflow_name)
+        return workflow is not None
+    finally:
+        await config_manager.aclose()
 
 def main():
     """Main entry point for the script."""
@@ -16,6 +16,12 @@ from enhanced_memory import EnhancedMemorySystem
 from validators import ValidationSystem
 from config_manager import DynamicConfigManager
 
+# System prompt additions: tasks validated by section headers get the list of
+# required headers appended, code generation gets the code instructions
+SECTION_HEADER_TASKS = frozenset({"requirements_analysis", "system_design", "implementation_planning", "code_review"})
+SECTION_HEADERS_INSTRUCTION = "\n\nIMPORTANT: Your response MUST include ALL of these section headers:\n"
+CODE_INSTRUCTIONS = "\n\nIMPORTANT: Your response MUST include actual code (not just descriptions). Use markdown code blocks with language tags. Include function definitions, class declarations, and import statements."
+
 class DynamicTaskOrchestrator:
     """Enhanced orchestrator with dynamic configuration for tasks across multiple models."""
     
@@ -115,33 +121,14 @@ class DynamicTaskOrchestrator:
         # Add validation instructions to system prompt
         validation_config = task_config.get("validation", {})
         
-        if task_name == "requirements_analysis":
-            format_instructions = "\n\nIMPORTANT: Your response MUST include ALL of these section headers:\n"
-            for section in validation_config.get("required_sections", []):
-                format_instructions += f"- {section}\n"
-            system_prompt = system_prompt + format_instructions
-        
-        elif task_name == "system_design":
-            format_instructions = "\n\nIMPORTANT: Your response MUST include ALL of these section headers:\n"
-            for section in validation_config.get("required_sections", []):
-                format_instructions += f"- {section}\n"
-            system_prompt = system_prompt + format_instructions
-        
-        elif task_name == "implementation_planning":
-            format_instructions = "\n\nIMPORTANT: Your response MUST include ALL of these section headers:\n"
-            for section in validation_config.get("required_sections", []):
-                format_instructions += f"- {section}\n"
+        if task_name in SECTION_HEADER_TASKS:
+            format_instructions = SECTION_HEADERS_INSTRUCTION + "".join(
+                f"- {section}\n" for section in validation_config.get("required_sections", [])
+            )
             system_prompt = system_prompt + format_instructions
         
         elif task_name == "code_generation":
-            code_instructions = "\n\nIMPORTANT: Your response MUST include actual code (not just descriptions). Use markdown code blocks with language tags. Include function definitions, class declarations, and import statements."
-            system_prompt = system_prompt + code_instructions
-        
-        elif task_name == "code_review":
-            format_instructions = "\n\nIMPORTANT: Your response MUST include ALL of these section headers:\n"
-            for section in validation_config.get("required_sections", []):
-                format_instructions += f"- {section}\n"
-            system_prompt = system_prompt + format_instructions
+            system_prompt = system_prompt + CODE_INSTRUCTIONS
         
         # Create messages array
         messages = [
@@ -6,6 +6,11 @@ import yaml
 from pathlib import Path
 from typing import Dict, List, Tuple, Any, Optional
 
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:  # libyaml not available
+    from yaml import SafeLoader
+
 from enhanced_config_manager import EnhancedConfigManager
 from enhanced_openrouter_adapter import EnhancedOpenRouterAdapter
 from enhanced_memory import EnhancedMemorySystem
@@ -87,7 +92,7 @@ class EnhancedCollaborativeTaskOrchestrator:
         if workflow_path.exists() and workflow_path.is_file():
             try:
                 with open(workflow_path, 'r') as f:
-                    workflow_config = yaml.safe_load(f)
+                    workflow_config = yaml.load(f, Loader=SafeLoader)
                 
                 # Extract stages based on format
                 if isinstance(workflow_config, list):
@@ -108,7 +113,7 @@ class EnhancedCollaborativeTaskOrchestrator:
         if workflow_file.exists():
             try:
                 with open(workflow_file, 'r') as f:
-                    workflow_config = yaml.safe_load(f)
+                    workflow_config = yaml.load(f, Loader=SafeLoader)
                 
                 # Extract stages based on format
                 if isinstance(workflow_config, list):
@@ -2,9 +2,25 @@
 import os
 import yaml
 import json
+import functools
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Dict, List, Any, Optional, Tuple
 
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:  # libyaml not available
+    from yaml import SafeLoader
+
+@functools.lru_cache(maxsize=128)
+def _parse_yaml_cached(path_str: str, mtime_ns: int, size: int) -> Any:
+    """Process-wide memo of parsed YAML files, keyed by path, mtime and size.
+    
+    The returned object is shared between callers and must not be mutated.
+    """
+    with open(path_str, 'r') as f:
+        return yaml.load(f, Loader=SafeLoader)
+
 class RoleConfigLoader:
     """Loads role configurations from individual files."""
     
@@ -19,9 +35,13 @@ class RoleConfigLoader:
         
     def load_all_roles(self):
         """Load all role configuration files from the roles directory."""
-        for role_file in self.roles_dir.glob("*.yml"):
-            role_name = role_file.stem
-            self.roles[role_name] = self.load_role(role_file)
+        # Read and parse the files in a small thread pool. Parsing holds the GIL
+        # (libyaml builds Python objects as it goes), so only the file reads overlap
+        role_files = list(self.roles_dir.glob("*.yml"))
+        with ThreadPoolExecutor(max_workers=min(8, len(role_files) or 1)) as executor:
+            loaded_roles = list(executor.map(self.load_role, role_files))
+        for role_file, role in zip(role_files, loaded_roles):
+            self.roles[role_file.stem] = role
         
         print(f"Loaded {len(self.roles)} role configurations")
         return self.roles
@@ -35,8 +55,8 @@ class RoleConfigLoader:
         Returns:
             Role configuration dictionary
         """
-        with open(role_file, 'r') as f:
-            role_config = yaml.safe_load(f)
+        st = role_file.stat()
+        role_config = _parse_yaml_cached(str(role_file), st.st_mtime_ns, st.st_size)
         return role_config.get('role', {})
     
     def get_role(self, role_name: str):
@@ -48,13 +68,19 @@ class RoleConfigLoader:
         Returns:
             Role configuration dictionary or None if not found
         """
-        # Try to load from file if not already loaded
-        if role_name not in self.roles:
+        # Loaded roles cost a single lookup; otherwise try to load from file
+        role = self.roles.get(role_name)
+        if role is None and role_name not in self.roles:
             role_file = self.roles_dir / f"{role_name}.yml"
             if role_file.exists():
-                self.roles[role_name] = self.load_role(role_file)
+                role = self.roles[role_name] = self.load_role(role_file)
                 
-        return self.roles.get(role_name)
+        return role
+    
+    @classmethod
+    def reset_caches(cls):
+        """Drop the process-wide cache of parsed role files (e.g. between tests)."""
+        _parse_yaml_cached.cache_clear()
 
 class EnhancedConfigManager:
     """Enhanced configuration manager that supports modular configuration files."""
@@ -81,13 +107,13 @@ class EnhancedConfigManager:
         system_file = self.config_dir / "system.yml"
         if system_file.exists():
             with open(system_file, 'r') as f:
-                self.system_config = yaml.safe_load(f)
+                self.system_config = yaml.load(f, Loader=SafeLoader)
                 
         # Load models configuration
         models_file = self.config_dir / "models.yml"
         if models_file.exists():
             with open(models_file, 'r') as f:
-                self.models_config = yaml.safe_load(f)
+                self.models_config = yaml.load(f, Loader=SafeLoader)
         
         # Initialize role loader
         roles_dir = self.config_dir / "roles"
@@ -9,6 +9,11 @@ from pathlib import Path
 from typing import Dict, List, Tuple, Any, Optional
 from datetime import datetime
 
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:  # libyaml not available
+    from yaml import SafeLoader
+
 # Import the enhanced rate limiting adapter
 from enhanced_rate_limiting_adapter import EnhancedRateLimitingAdapter
 from enhanced_memory import EnhancedMemorySystem
@@ -115,7 +120,7 @@ class EnhancedRateLimitingOrchestrator:
         if workflow_path.exists() and workflow_path.is_file():
             try:
                 with open(workflow_path, 'r') as f:
-                    workflow_config = yaml.safe_load(f)
+                    workflow_config = yaml.load(f, Loader=SafeLoader)
                 
                 # Extract stages based on format
                 if isinstance(workflow_config, list):
@@ -136,7 +141,7 @@ class EnhancedRateLimitingOrchestrator:
         if workflow_file.exists():
             try:
                 with open(workflow_file, 'r') as f:
-                    workflow_config = yaml.safe_load(f)
+                    workflow_config = yaml.load(f, Loader=SafeLoader)
                 
                 # Extract stages based on format
                 if isinstance(workflow_config, list):
@@ -82,7 +82,6 @@ class EnhancedTaskOrchestrator:
         # Note: Original enhanced_task_orchestrator didn't use get_task_config
         # We adapt it to use role and model info from the manager
         role_manager = self.config_manager.get_role_manager()
-        model_registry = self.config_manager.get_model_registry()
         
         role_info = role_manager.get_role(role_name)
         if not role_info:
@@ -90,7 +89,7 @@ class EnhancedTaskOrchestrator:
             role_info = {}
 
         # Determine models
-        primary_model, backup_model = model_registry.get_best_model_for_task(task_name)
+        primary_model, backup_model = await self.config_manager.aget_best_model_for_task(task_name)
         
         # Get system prompt from role
         system_prompt = role_info.get("system_prompt", f"You are an AI assistant tasked with {task_name}.")
@@ -17,6 +17,12 @@ from validators import ValidationSystem
 # Import DynamicConfigManager from the correct location (assuming it's in the parent dir)
 from ..config_manager import DynamicConfigManager
 
+# System prompt additions: tasks validated by section headers get the list of
+# required headers appended, code generation gets the code instructions
+SECTION_HEADER_TASKS = frozenset({"requirements_analysis", "system_design", "implementation_planning", "code_review"})
+SECTION_HEADERS_INSTRUCTION = "\n\nIMPORTANT: Your response MUST include ALL of these section headers:\n"
+CODE_INSTRUCTIONS = "\n\nIMPORTANT: Your response MUST include actual code (not just descriptions). Use markdown code blocks with language tags. Include function definitions, class declarations, and import statements."
+
 class DynamicTaskOrchestrator:
     """Enhanced orchestrator with dynamic configuration for tasks across multiple models."""
     
@@ -71,7 +77,11 @@ class DynamicTaskOrchestrator:
     async def initialize(self) -> None:
         """Initialize the orchestrator with all components."""
         await self.config_manager.initialize()
-    
+        
+    async def aclose(self) -> None:
+        """Release the config manager's network resources."""
+        await self.config_manager.aclose()
+        
     # Add these methods to your DynamicTaskOrchestrator class
 
     async def _execute_task(self, 
@@ -90,7 +100,6 @@ class DynamicTaskOrchestrator:
         """
         # Get managers from the config manager
         role_manager = self.config_manager.get_role_manager()
-        model_registry = self.config_manager.get_model_registry()
         
         role_info = role_manager.get_role(role_name)
         if not role_info:
@@ -98,7 +107,7 @@ class DynamicTaskOrchestrator:
             role_info = {}
         
         # Determine models
-        primary_model, backup_model = model_registry.get_best_model_for_task(task_name)
+        primary_model, backup_model = await self.config_manager.aget_best_model_for_task(task_name)
         
         # Get system prompt from role
         system_prompt = role_info.get("system_prompt", f"You are an AI assistant tasked with {task_name}.")
@@ -148,33 +157,14 @@ class DynamicTaskOrchestrator:
         # Add validation instructions to system prompt
         validation_config = task_config_for_adapter.get("validation", {})
           
-        if task_name == "requirements_analysis":
-            format_instructions = "\n\nIMPORTANT: Your response MUST include ALL of these section headers:\n"
-            for section in validation_config.get("required_sections", []):
-                format_instructions += f"- {section}\n"
-            system_prompt = system_prompt + format_instructions
-        
-        elif task_name == "system_design":
-            format_instructions = "\n\nIMPORTANT: Your response MUST include ALL of these section headers:\n"
-            for section in validation_config.get("required_sections", []):
-                format_instructions += f"- {section}\n"
-            system_prompt = system_prompt + format_instructions
-        
-        elif task_name == "implementation_planning":
-            format_instructions = "\n\nIMPORTANT: Your response MUST include ALL of these section headers:\n"
-            for section in validation_config.get("required_sections", []):
-                format_instructions += f"- {section}\n"
+        if task_name in SECTION_HEADER_TASKS:
+            format_instructions = SECTION_HEADERS_INSTRUCTION + "".join(
+                f"- {section}\n" for section in validation_config.get("required_sections", [])
+            )
             system_prompt = system_prompt + format_instructions
         
         elif task_name == "code_generation":
-            code_instructions = "\n\nIMPORTANT: Your response MUST include actual code (not just descriptions). Use markdown code blocks with language tags. Include function definitions, class declarations, and import statements."
-            system_prompt = system_prompt + code_instructions
-        
-        elif task_name == "code_review":
-            format_instructions = "\n\nIMPORTANT: Your response MUST include ALL of these section headers:\n"
-            for section in validation_config.get("required_sections", []):
-                format_instructions += f"- {section}\n"
-            system_prompt = system_prompt + format_instructions
+            system_prompt = system_prompt + CODE_INSTRUCTIONS
         
         # Create messages array using the potentially enhanced system_prompt
         messages = [
@@ -397,18 +387,21 @@ async def main():
     orchestrator = DynamicTaskOrchestrator("config.yml")
     await orchestrator.initialize()
     
-    # Example: Execute the standard workflow
-    user_idea = "Create a simple Python web server using Flask that returns 'Hello, World!' on the root path."
-    results = await orchestrator.execute_workflow(
-        workflow_name="standard", 
-        input_data=user_idea,
-        workspace_dir="./dynamic_workspace"
-    )
-    
-    # Print final result (e.g., code review comments)
-    final_output_key = orchestrator.config_manager.get_workflow_stages("standard")[-1]["output"]
-    print("\n=== Final Workflow Output ===")
-    print(results.get(final_output_key, "Workflow did not complete successfully."))
+    try:
+        # Example: Execute the standard workflow
+        user_idea = "Create a simple Python web server using Flask that returns 'Hello, World!' on the root path."
+        results = await orchestrator.execute_workflow(
+            workflow_name="standard", 
+            input_data=user_idea,
+            workspace_dir="./dynamic_workspace"
+        )
+        
+        # Print final result (e.g., code review comments)
+        final_output_key = orchestrator.config_manager.get_workflow_stages("standard")[-1]["output"]
+        print("\n=== Final Workflow Output ===")
+        print(results.get(final_output_key, "Workflow did not complete successfully."))
+    finally:
+        await orchestrator.aclose()
 
 if __name__ == "__main__":
     asyncio.run(main())
\ No newline at end of file
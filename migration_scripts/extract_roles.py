@@ -4,6 +4,11 @@ import json
 import os
 from pathlib import Path
 
+try:
+    from yaml import CSafeLoader as SafeLoader, CSafeDumper as SafeDumper
+except ImportError:  # libyaml not available
+    from yaml import SafeLoader, SafeDumper
+
 def create_config_directories():
     """Create the new configuration directory structure."""
     base_path = Path("/Users/rian.vu/Documents/Free-Models-MetaGPT/config")
@@ -20,7 +25,7 @@ def extract_roles_from_config():
     config_path = Path("/Users/rian.vu/Documents/Free-Models-MetaGPT/config.yml")
     
     with open(config_path, 'r') as f:
-        config = yaml.safe_load(f)
+        config = yaml.load(f, Loader=SafeLoader)
     
     # Extract roles section
     roles = config.get("ROLES", {})
@@ -43,7 +48,7 @@ def extract_roles_from_config():
     
     # Save models configuration
     with open(base_path / "models.yml", 'w') as f:
-        yaml.dump(models_config, f, default_flow_style=False, sort_keys=False)
+        yaml.dump(models_config, f, Dumper=SafeDumper, default_flow_style=False, sort_keys=False)
     
     # Extract system configuration
     system_config = {
@@ -54,7 +59,7 @@ def extract_roles_from_config():
     
     # Save system configuration
     with open(base_path / "system.yml", 'w') as f:
-        yaml.dump(system_config, f, default_flow_style=False, sort_keys=False)
+        yaml.dump(system_config, f, Dumper=SafeDumper, default_flow_style=False, sort_keys=False)
     
     # Extract and save each role configuration
     for role_name, role_config in roles.items():
@@ -90,7 +95,7 @@ def extract_roles_from_config():
         
         # Save role configuration
         with open(roles_path / f"{role_name}.yml", 'w') as f:
-            yaml.dump(role_data, f, default_flow_style=False, sort_keys=False)
+            yaml.dump(role_data, f, Dumper=SafeDumper, default_flow_style=False, sort_keys=False)
     
     print(f"Extracted {len(roles)} roles to {roles_path}")
     print(f"Created models.yml and system.yml in {base_path}")
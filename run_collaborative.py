@@ -132,34 +132,37 @@ async def main():
     orchestrator = CollaborativeTaskOrchestrator(config_path)
     await orchestrator.initialize()
     
-    print(f"\n=== Starting Collaborative Workflow: {os.path.basename(workflow_path)} ===")
-    print(f"Input: {input_data[:100]}..." if len(input_data) > 100 else f"Input: {input_data}")
-    
-    # Execute the workflow
-    print("\n=== Starting conversation between expert models ===\n")
-    print("Messages will be displayed in real-time as models respond...\n")
+    try:
+        print(f"\n=== Starting Collaborative Workflow: {os.path.basename(workflow_path)} ===")
+        print(f"Input: {input_data[:100]}..." if len(input_data) > 100 else f"Input: {input_data}")
+        
+        # Execute the workflow
+        print("\n=== Starting conversation between expert models ===\n")
+        print("Messages will be displayed in real-time as models respond...\n")
 
-    # Extract workflow name from path
-    workflow_name = os.path.splitext(os.path.basename(workflow_path))[0]
-    
-    results = await orchestrator.execute_workflow(workflow_name, input_data)
-    
-    # Ensure output directory exists
-    output_dir = os.path.dirname(args.output)
-    if output_dir and not os.path.exists(output_dir):
-        os.makedirs(output_dir, exist_ok=True)
-    
-    # Save results to output file
-    with open(args.output, "w") as f:
-        json.dump(results, f, indent=2)
-    
-    print(f"\n=== Workflow completed. Results saved to {args.output} ===")
-    
-    # Print a summary of the results
-    print("\nWorkflow Summary:")
-    for task, result in results.items():
-        if not task.endswith("_validation"):
-            print(f"- {task}: {len(result)} characters")
+        # Extract workflow name from path
+        workflow_name = os.path.splitext(os.path.basename(workflow_path))[0]
+        
+        results = await orchestrator.execute_workflow(workflow_name, input_data)
+        
+        # Ensure output directory exists
+        output_dir = os.path.dirname(args.output)
+        if output_dir and not os.path.exists(output_dir):
+            os.makedirs(output_dir, exist_ok=True)
+        
+        # Save results to output file
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+        
+        print(f"\n=== Workflow completed. Results saved to {args.output} ===")
+        
+        # Print a summary of the results
+        print("\nWorkflow Summary:")
+        for task, result in results.items():
+            if not task.endswith("_validation"):
+                print(f"- {task}: {len(result)} characters")
+    finally:
+        await orchestrator.aclose()
 
 if __name__ == "__main__":
     asyncio.run(main())
\ No newline at end of file
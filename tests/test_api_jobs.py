@@ -0,0 +1,81 @@
+import asyncio
+import importlib.util
+import json
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+API_MAIN = Path(__file__).resolve().parent.parent / "api" / "main.py"
+
+
+@pytest.fixture
+def api_module():
+    spec = importlib.util.spec_from_file_location("api_main", API_MAIN)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture
+def api(api_module, tmp_path, monkeypatch):
+    module = api_module
+
+    (tmp_path / "config.yml").write_text("OPENROUTER_CONFIG: {}\nMODEL_REGISTRY: {}\n")
+    (tmp_path / "workflows").mkdir()
+    (tmp_path / "workflows" / "collaborative_workflow.yml").write_text("stages: []\n")
+    monkeypatch.setattr(module, "PARENT_DIR", str(tmp_path))
+    monkeypatch.setattr(module, "WORKSPACE_ROOT", str(tmp_path / "workspace"))
+
+    async def fake_run_job(job_id, cmd, run_dir, output_file, log_path, env):
+        await asyncio.sleep(0)
+    monkeypatch.setattr(module, "_run_job", fake_run_job)
+    return module
+
+
+def test_concurrent_jobs_get_separate_run_directories(api):
+    async def scenario():
+        requests = [api.PromptRequest(prompt=f"prompt {i}", api_key="key") for i in range(3)]
+        started = await asyncio.gather(*(api.run_metagpt(request) for request in requests))
+        # Let the (stubbed) background jobs finish
+        await asyncio.sleep(0.01)
+        statuses = [await api.get_metagpt_job(job["job_id"]) for job in started]
+        return started, statuses
+
+    started, statuses = asyncio.run(scenario())
+
+    run_dirs = [os.path.join(api.WORKSPACE_ROOT, job["workspace_id"]) for job in started]
+    assert len(set(run_dirs)) == 3
+    for i, run_dir in enumerate(run_dirs):
+        with open(os.path.join(run_dir, "input.txt")) as f:
+            assert f.read() == f"prompt {i}"
+    assert [status["job_id"] for status in statuses] == [job["job_id"] for job in started]
+    # Finished jobs are not kept in memory
+    assert api.JOBS == {}
+
+
+def test_unknown_job_id_is_not_found(api):
+    with pytest.raises(api.HTTPException) as exc_info:
+        asyncio.run(api.get_metagpt_job("../../etc"))
+    assert exc_info.value.status_code == 404
+
+
+def test_job_survives_output_lines_longer_than_the_read_buffer(api_module, tmp_path):
+    run_dir = tmp_path / "run"
+    run_dir.mkdir()
+    output_file = run_dir / "output.json"
+    log_path = run_dir / "run.log"
+    script = (
+        "import sys; "
+        "sys.stdout.write('x' * 2000000 + '\\nlast line\\n'); "
+        f"open({str(output_file)!r}, 'w').write('{{\"ok\": true}}')"
+    )
+    asyncio.run(api_module._run_job(
+        "job", [sys.executable, "-c", script], str(run_dir), str(output_file), str(log_path), dict(os.environ)))
+
+    with open(run_dir / "status.json") as f:
+        status = json.load(f)
+    assert status["status"] == "done"
+    assert status["result"] == {"ok": True}
+    assert log_path.stat().st_size == 2000000 + len("\nlast line\n")
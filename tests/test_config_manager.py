@@ -0,0 +1,110 @@
+import asyncio
+import os
+
+import pytest
+
+import config_manager
+from config_manager import DynamicConfigManager
+
+CONFIG_YML = """
+OPENROUTER_CONFIG:
+  default_api_key: test-key
+MODEL_REGISTRY:
+  model_capabilities:
+    code_generation:
+      - org/best
+      - org/good
+  default_models_by_task:
+    default: [org/default-a, org/default-b]
+ROLES: {}
+"""
+
+MODELS = {"data": [
+    {"id": "org/other:free", "context_length": 8000},
+    {"id": "org/good:free", "context_length": 8000},
+    {"id": "org/best:free", "context_length": 8000},
+]}
+
+
+@pytest.fixture
+def config_path(tmp_path, monkeypatch):
+    monkeypatch.setattr(config_manager, "MODELS_CACHE_PATH", tmp_path / "cache" / "models.json")
+    path = tmp_path / "config.yml"
+    path.write_text(CONFIG_YML)
+    return path
+
+
+@pytest.fixture
+def slow_models_api(monkeypatch):
+    async def fake_request_models(self, url):
+        await asyncio.sleep(0.05)
+        return MODELS
+    monkeypatch.setattr(config_manager.ModelRegistry, "_request_models", fake_request_models)
+
+
+def test_sync_ranking_is_refused_until_background_fetch_finishes(config_path, slow_models_api):
+    async def scenario():
+        manager = DynamicConfigManager(str(config_path))
+        await manager.initialize()
+        try:
+            registry = manager.get_model_registry()
+            # Ranking now would only see the config defaults
+            with pytest.raises(RuntimeError):
+                registry.get_best_model_for_task("code_generation")
+            await manager.ensure_models_loaded()
+            return registry.get_best_model_for_task("code_generation")
+        finally:
+            await manager.aclose()
+
+    assert asyncio.run(scenario()) == ("org/best:free", "org/good:free")
+
+
+def test_aget_best_model_waits_for_background_fetch(config_path, slow_models_api):
+    async def scenario():
+        manager = DynamicConfigManager(str(config_path))
+        await manager.initialize()
+        try:
+            return await manager.aget_best_model_for_task("code_generation")
+        finally:
+            await manager.aclose()
+
+    assert asyncio.run(scenario()) == ("org/best:free", "org/good:free")
+
+
+def test_generate_config_returns_only_the_task_model_mapping(config_path, slow_models_api):
+    async def scenario():
+        manager = DynamicConfigManager(str(config_path))
+        await manager.initialize()
+        try:
+            return await manager.generate_config_from_available_models()
+        finally:
+            await manager.aclose()
+
+    assert asyncio.run(scenario()) == {"TASK_MODEL_MAPPING": {
+        "code_generation": {
+            "primary": {"model": "org/best:free", "context_window": 8000},
+            "backup": {"model": "org/good:free", "context_window": 8000},
+        },
+    }}
+
+
+def test_workflow_edits_are_picked_up(config_path):
+    workflow_file = config_path.parent / "workflows" / "review_only.yml"
+    workflow_file.parent.mkdir()
+    workflow_file.write_text("stages:\n  - {name: review, task: code_review}\n")
+
+    async def scenario():
+        manager = DynamicConfigManager(str(config_path))
+        await manager.initialize(fetch_models=False)
+        try:
+            before = manager.get_workflow_stages("review_only")
+            workflow_file.write_text("stages:\n  - {name: design, task: system_design}\n")
+            st = workflow_file.stat()
+            os.utime(workflow_file, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+            return before, manager.get_workflow_stages("review_only")
+        finally:
+            await manager.aclose()
+
+    before, after = asyncio.run(scenario())
+    assert before == [{"name": "review", "task": "code_review"}]
+    assert after == [{"name": "design", "task": "system_design"}]
@@ -0,0 +1,26 @@
+import os
+
+import pytest
+
+from enhanced_config_manager import RoleConfigLoader
+
+
+@pytest.fixture(autouse=True)
+def fresh_role_cache():
+    RoleConfigLoader.reset_caches()
+    yield
+    RoleConfigLoader.reset_caches()
+
+
+def test_role_file_edits_are_picked_up(tmp_path):
+    role_file = tmp_path / "architect.yml"
+    role_file.write_text("role:\n  name: Architect\n")
+    assert RoleConfigLoader(tmp_path).load_all_roles() == {"architect": {"name": "Architect"}}
+
+    role_file.write_text("role:\n  name: Lead Architect\n")
+    st = role_file.stat()
+    os.utime(role_file, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+    assert RoleConfigLoader(tmp_path).get_role("architect") == {"name": "Lead Architect"}
+
+    # Parsed roles are only cached in memory
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["architect.yml"]
@@ -0,0 +1,20 @@
+import gc
+import json
+import weakref
+
+import enhanced_memory
+
+
+def test_memory_system_is_collectable_after_close(tmp_path):
+    memory = enhanced_memory.EnhancedMemorySystem({"save_delay_seconds": 60}, str(tmp_path))
+    memory.add_document("Some notes about the payment service", {"task": "notes"})
+    ref = weakref.ref(memory)
+
+    # close() writes the pending change without waiting for the debounce timer
+    memory.close()
+    with open(tmp_path / "memory.json") as f:
+        assert len(json.load(f)) == 1
+
+    del memory
+    gc.collect()
+    assert ref() is None
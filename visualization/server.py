@@ -22,6 +22,11 @@ import aiofiles.os
 from watchdog.observers import Observer
 from watchdog.events import FileSystemEventHandler
 
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:  # libyaml not available
+    from yaml import SafeLoader
+
 # Define request models
 class PromptRequest(BaseModel):
     prompt: str
@@ -296,6 +301,9 @@ else:
     print(f"==DEBUG== Config dir: {config_dir}")
     print(f"==DEBUG== Roles dir: {roles_dir}")
 
+# File types accepted by the upload/list/delete endpoints
+MANAGED_FILE_TYPES = frozenset({"workflow", "config", "role"})
+
 # Set up log patterns (used for log searching)
 logs_pattern = os.path.join(logs_dir, "*.json")
 workspace_pattern = os.path.join(workspace_dir, "**/*.json")
@@ -854,7 +862,7 @@ async def get_output():
 async def upload_file(file_type: str, file: UploadFile = File(...)):
     """Upload configuration files"""
     try:
-        if file_type not in ["workflow", "config", "role"]:
+        if file_type not in MANAGED_FILE_TYPES:
             raise HTTPException(status_code=400, detail=f"Invalid file type: {file_type}")
             
         # Determine target directory
@@ -897,7 +905,7 @@ async def upload_file(file_type: str, file: UploadFile = File(...)):
 async def list_files(file_type: str):
     """List available configuration files"""
     try:
-        if file_type not in ["workflow", "config", "role"]:
+        if file_type not in MANAGED_FILE_TYPES:
             raise HTTPException(status_code=400, detail=f"Invalid file type: {file_type}")
             
         # Determine target directory
@@ -953,7 +961,7 @@ async def list_files(file_type: str):
 async def delete_file(file_type: str, filename: str):
     """Delete a configuration file"""
     try:
-        if file_type not in ["workflow", "config", "role"]:
+        if file_type not in MANAGED_FILE_TYPES:
             raise HTTPException(status_code=400, detail=f"Invalid file type: {file_type}")
             
         # Determine target directory
@@ -1232,198 +1240,6 @@ async def run_job_in_background(api_url, payload, job_id):
                 "error": error_message
             })
 
-async def monitor_workspace_files(job_id, workspace_id):
-    """Monitor workspace files for changes and send updates via WebSocket."""
-    print(f"Starting workspace file monitoring for job {job_id}, workspace {workspace_id}")
-    
-    # Define the paths to monitor
-    logs_dir = "/logs"  # Main logs directory
-    workspace_dir = f"/workspace/{workspace_id}"  # Job-specific workspace
-    workspace_logs_dir = f"{workspace_dir}/logs"  # Job-specific logs directory
-    
-    print(f"Monitoring directories for job {job_id}:")
-    print(f"  - Main logs: {logs_dir}")
-    print(f"  - Workspace: {workspace_dir}")
-    print(f"  - Workspace logs: {workspace_logs_dir}")
-    
-    # Track processed files to avoid duplicates
-    processed_files = set()
-    
-    # Track if any message has been sent to the client
-    message_sent = False
-    
-    try:
-        # Initial scan of existing files
-        print(f"==DEBUG== Performing initial scan for job {job_id}")
-        
-        # Create necessary directories if they don't exist
-        for directory in [workspace_dir, workspace_logs_dir]:
-            try:
-                os.makedirs(directory, exist_ok=True)
-                print(f"==DEBUG== Created directory: {directory}")
-            except Exception as e:
-                print(f"==DEBUG== Error creating directory {directory}: {str(e)}")
-        
-        # Main monitoring loop
-        check_count = 0
-        while job_id in manager.active_connections:
-            try:
-                check_count += 1
-                # Check for new logs in workspace logs directory
-                new_logs = []
-                
-                # First check the workspace logs directory
-                if os.path.exists(workspace_logs_dir):
-                    if check_count % 10 == 0:  # Reduce log spam
-                        print(f"==DEBUG== Checking {workspace_logs_dir} for new files")
-                    for filename in os.listdir(workspace_logs_dir):
-                        if filename.endswith(".json"):
-                            filepath = os.path.join(workspace_logs_dir, filename)
-                            if filepath not in processed_files:
-                                print(f"==DEBUG== Found new log file: {filepath}")
-                                new_logs.append(filepath)
-                
-                # Also check the main logs directory
-                if os.path.exists(logs_dir):
-                    if check_count % 10 == 0:  # Reduce log spam
-                        print(f"==DEBUG== Checking {logs_dir} for new files")
-                    for filename in os.listdir(logs_dir):
-                        if filename.endswith(".json") and job_id in filename:
-                            filepath = os.path.join(logs_dir, filename)
-                            if filepath not in processed_files:
-                                print(f"==DEBUG== Found new log file: {filepath}")
-                                new_logs.append(filepath)
-                
-                # Process any new log files
-                for filepath in new_logs:
-                    try:
-                        print(f"==DEBUG== Processing log file: {filepath}")
-                        with open(filepath, 'r') as f:
-                            log_data = json.load(f)
-                        
-                        # Extract content and role from the log data
-                        role = log_data.get('role', 'system')
-                        content = log_data.get('content', '')
-                        
-                        # For API response log files with a different structure
-                        if not content and 'response' in log_data:
-                            print(f"==DEBUG== Found API response log file: {filepath}")
-                            
-                            try:
-                                response = log_data['response']
-                                if isinstance(response, dict) and 'choices' in response:
-                                    choices = response['choices']
-                                    print(f"==DEBUG== Found {len(choices) if choices else 0} choices in response")
-                                    
-                                    if choices and isinstance(choices, list) and len(choices) > 0:
-                                        choice = choices[0]
-                                        print(f"==DEBUG== Examining first choice")
-                                        
-                                        if isinstance(choice, dict) and 'message' in choice:
-                                            message = choice['message']
-                                            print(f"==DEBUG== Found message in choice")
-                                            
-                                            if isinstance(message, dict) and 'content' in message:
-                                                content = message['content']
-                                                print(f"==DEBUG== Extracted content from message ({len(content)} chars)")
-                                
-                                # Use the role from the log file if available
-                                if role == 'system' and 'role' in log_data:
-                                    role = log_data['role']
-                                    print(f"==DEBUG== Using role from log file: {role}")
-                            except Exception as e:
-                                print(f"==DEBUG== Error extracting content from API response: {str(e)}")
-                                import traceback
-                                traceback.print_exc()
-                        
-                        if content:
-                            print(f"==DEBUG== Sending content update for role: {role}")
-                            # Send the update with the extracted content
-                            update_success = await manager.send_update(job_id, {
-                                "status": "update",
-                                "role": role,
-                                "content": content,
-                                "message": f"Received message from {role}",
-                                "timestamp": time.time()
-                            })
-                            
-                            if update_success:
-                                print(f"==DEBUG== Update sent successfully for {filepath}")
-                                message_sent = True
-                            else:
-                                print(f"==DEBUG== Failed to send update for {filepath} - WebSocket might be disconnected")
-                        else:
-                            print(f"==DEBUG== No content found in {filepath}")
-                        
-                        # Mark as processed regardless of content
-                        processed_files.add(filepath)
-                        
-                    except json.JSONDecodeError as e:
-                        print(f"==DEBUG== JSON decode error for {filepath}: {str(e)}")
-                    except Exception as e:
-                        print(f"==DEBUG== Error processing log file {filepath}: {str(e)}")
-                
-                # Check for output.json in the workspace directory
-                output_path = os.path.join(workspace_dir, "output.json")
-                if os.path.exists(output_path) and output_path not in processed_files:
-                    try:
-                        print(f"==DEBUG== Processing output file: {output_path}")
-                        with open(output_path, 'r') as f:
-                            output_data = json.load(f)
-                        
-                        # If output_data is a list, send each item as a separate message
-                        if isinstance(output_data, list):
-                            for item in output_data:
-                                role = item.get('role', 'system')
-                                content = item.get('content', '')
-                                
-                                if content:
-                                    print(f"==DEBUG== Sending output content update for role: {role}")
-                                    update_success = await manager.send_update(job_id, {
-                                        "status": "update",
-                                        "role": role,
-                                        "content": content,
-                                        "message": f"Received message from {role}",
-                                        "timestamp": time.time()
-                                    })
-                                    
-                                    if update_success:
-                                        message_sent = True
-                        
-                        # Mark as processed
-                        processed_files.add(output_path)
-                        
-                    except json.JSONDecodeError as e:
-                        print(f"==DEBUG== JSON decode error for {output_path}: {str(e)}")
-                    except Exception as e:
-                        print(f"==DEBUG== Error processing output file: {str(e)}")
-                
-                # Send a status update every 5 seconds if no messages have been sent
-                if not message_sent and check_count % 10 == 0:
-                    try:
-                        print(f"==DEBUG== Sending status update for job {job_id}")
-                        await manager.send_update(job_id, {
-                            "status": "status",
-                            "message": f"Monitoring files for job {job_id}...",
-                            "timestamp": time.time()
-                        })
-                    except Exception as e:
-                        print(f"==DEBUG== Error sending status update: {str(e)}")
-                
-                # Sleep for a shorter time before checking again (0.5 seconds instead of 1)
-                await asyncio.sleep(0.5)
-                
-            except Exception as e:
-                print(f"==DEBUG== Error in monitoring loop for {job_id}: {str(e)}")
-                await asyncio.sleep(2)  # Longer sleep on error
-    
-    except asyncio.CancelledError:
-        print(f"==DEBUG== File monitoring task for job {job_id} was cancelled")
-    except Exception as e:
-        print(f"==DEBUG== Unexpected error in file monitoring for {job_id}: {str(e)}")
-        import traceback
-        traceback.print_exc()
-
 @app.get("/api/test_websocket/{job_id}")
 async def test_websocket(job_id: str):
     """Test endpoint to send a message directly to a WebSocket client."""
@@ -1599,6 +1415,11 @@ async def view_log(filename: str):
         print(f"Error reading log file {filename}: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error reading log file: {str(e)}")
 
+def _load_yaml_path(file_path: str) -> Any:
+    """Read and parse a YAML file (run in a worker thread)."""
+    with open(file_path, "r") as f:
+        return yaml.load(f, Loader=SafeLoader)
+
 @app.get("/api/workflows")
 async def list_workflows():
     """List available workflows and extract their participants"""
@@ -1644,38 +1465,41 @@ async def list_workflows():
         
         # If the workflows directory exists, look for YAML files
         elif os.path.exists(workflows_dir):
-            # List all YAML files in the workflows directory
-            for filename in os.listdir(workflows_dir):
-                if filename.endswith((".yml", ".yaml")):
-                    file_path = os.path.join(workflows_dir, filename)
-                    
-                    # Extract workflow metadata and participants
-                    try:
-                        with open(file_path, "r") as f:
-                            workflow_data = yaml.safe_load(f)
-                            
-                        workflow_info = {
-                            "filename": filename,
-                            "name": workflow_data.get("name", filename.split(".")[0]),
-                            "description": workflow_data.get("description", ""),
-                            "participants": []
-                        }
-                        
-                        # Extract unique participants from all stages
-                        all_participants = set()
-                        stages = workflow_data.get("stages", [])
-                        
-                        for stage in stages:
-                            stage_participants = stage.get("participants", [])
-                            for participant in stage_participants:
-                                role = participant.get("role", "")
-                                if role and role not in all_participants:
-                                    all_participants.add(role)
+            # List all YAML files in the workflows directory and parse them in
+            # worker threads, so the reads overlap and the event loop stays free
+            filenames = [filename for filename in os.listdir(workflows_dir) if filename.endswith((".yml", ".yaml"))]
+            parsed_files = await asyncio.gather(
+                *(asyncio.to_thread(_load_yaml_path, os.path.join(workflows_dir, filename)) for filename in filenames),
+                return_exceptions=True
+            )
+            for filename, workflow_data in zip(filenames, parsed_files):
+                # Extract workflow metadata and participants
+                try:
+                    if isinstance(workflow_data, Exception):
+                        raise workflow_data
                         
-                        workflow_info["participants"] = sorted(list(all_participants))
-                        workflow_files.append(workflow_info)
-                    except Exception as e:
-                        print(f"Error parsing workflow file {filename}: {str(e)}")
+                    workflow_info = {
+                        "filename": filename,
+                        "name": workflow_data.get("name", filename.split(".")[0]),
+                        "description": workflow_data.get("description", ""),
+                        "participants": []
+                    }
+                    
+                    # Extract unique participants from all stages
+                    all_participants = set()
+                    stages = workflow_data.get("stages", [])
+                    
+                    for stage in stages:
+                        stage_participants = stage.get("participants", [])
+                        for participant in stage_participants:
+                            role = participant.get("role", "")
+                            if role and role not in all_participants:
+                                all_participants.add(role)
+                    
+                    workflow_info["participants"] = sorted(list(all_participants))
+                    workflow_files.append(workflow_info)
+                except Exception as e:
+                    print(f"Error parsing workflow file {filename}: {str(e)}")
         
         return workflow_files
     except Exception as e: